@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 에이전트 정의
+Data Fetch → (Trend Model | Hierarchy | Color Analysis | Competitor | Anomaly) 동시 실행
+"""
+
+import time
+from collections import deque
+from dataclasses import asdict
+from pathlib import Path
+
+from anomaly import BreakoutDetector
+from competitor import build_store, iter_snapshot_files
+from datasets import load_data, load_snapshot
+from forecasting import advanced_forecast
+from hierarchy import build_hierarchy
+from orchestrator import Agent, Orchestrator
+
+DATA_DIR = Path(__file__).parent / "data"
+MAX_FORECAST_PERIOD = 12
+MAX_ALERTS = 500            # 감지 알림 보관 개수 (오래된 것부터 버림 - 상태 크기 고정)
+
+
+def make_fetch_agent(snapshot_path=None, shared_cache=None, shared_ttl=None):
+    # 스냅샷 경로가 주어지면 첫 수집만 스냅샷에서 읽고, 이후 갱신은 실제 수집
+    pending = [snapshot_path] if snapshot_path is not None else []
+
+    def fetch(inputs):
+        prebuilt = load_snapshot(pending.pop()) if pending else None
+        if prebuilt is None and shared_cache is not None:
+            # 레플리카 중 한 곳만 수집하고 나머지는 같은 데이터를 재사용.
+            # 키에 갱신 주기 번호와 세대를 넣어 주기 갱신/강제 갱신 시에는 새로 수집
+            epoch = int(time.time() // shared_ttl) if shared_ttl else 0
+            key = shared_cache.key("datasets", epoch, shared_cache.generation("datasets"))
+            prebuilt = shared_cache.get_or_compute(key, load_data, shared_ttl)
+        return fetch_agent(inputs, prebuilt)
+
+    return fetch
+
+
+def fetch_agent(inputs, prebuilt=None):
+    tiktok_data, historical_data, color_trends, competitor_data = prebuilt or load_data()
+    return {
+        "tiktok_data": tiktok_data,
+        "historical_data": historical_data,
+        "color_trends": color_trends,
+        "competitor_data": competitor_data,
+    }
+
+
+def make_trend_agent(shared_cache=None, shared_ttl=None):
+    def trend(inputs):
+        return trend_agent(inputs, shared_cache, shared_ttl)
+
+    return trend
+
+
+def trend_agent(inputs, shared_cache=None, shared_ttl=None):
+    # 최대 기간으로 한 번만 예측 (앞 n개월 값은 기간과 무관하게 동일)
+    trends = inputs["Data Fetch"]["historical_data"]["ingredient_trends"]
+    if shared_cache is None:
+        return {name: advanced_forecast(data, MAX_FORECAST_PERIOD) for name, data in trends.items()}
+    # 입력 시계열 내용 기반 키 - 같은 데이터의 예측은 레플리카 전체에서 한 번만 계산
+    return {
+        name: shared_cache.get_or_compute(
+            shared_cache.key("forecast", data, MAX_FORECAST_PERIOD),
+            lambda data=data: advanced_forecast(data, MAX_FORECAST_PERIOD),
+            shared_ttl,
+        )
+        for name, data in trends.items()
+    }
+
+
+def make_hierarchy_agent(shared_cache=None, shared_ttl=None):
+    def hierarchy(inputs):
+        return hierarchy_agent(inputs, shared_cache, shared_ttl)
+
+    return hierarchy
+
+
+def hierarchy_agent(inputs, shared_cache=None, shared_ttl=None):
+    # 전체/카테고리/성분/지역 예측을 한 번에 계산·조정해 두고 화면에서는 조회만
+    data = inputs["Data Fetch"]
+    sources = (
+        data["historical_data"]["ingredient_trends"],
+        data["tiktok_data"]["ingredient_mentions"],
+        data["tiktok_data"]["hashtag_trends"],
+    )
+
+    def compute():
+        return build_hierarchy(*sources).forecast(MAX_FORECAST_PERIOD)
+
+    if shared_cache is None:
+        return compute()
+    # 입력 시계열/매핑 내용 기반 키 - 같은 입력의 조정 예측은 레플리카 전체에서 한 번만 계산
+    return shared_cache.get_or_compute(
+        shared_cache.key("hierarchy", *sources, MAX_FORECAST_PERIOD), compute, shared_ttl
+    )
+
+
+def color_agent(inputs):
+    colors = inputs["Data Fetch"]["color_trends"]
+    by_season = {}
+    for row in colors:
+        by_season.setdefault(row["season"], []).append(row["color"])
+    return {
+        "ranked": sorted(colors, key=lambda row: row["growth"], reverse=True),
+        "by_season": by_season,
+    }
+
+
+def make_competitor_agent(snapshot_dir=DATA_DIR / "competitor_snapshots"):
+    # 오케스트레이터당 저장소 하나를 유지하고 새로 생긴 스냅샷 파일만 반영.
+    # 이전 스냅샷이 들고 있는 저장소는 건드리지 않도록 새 파일이 있을 때만 복사본에 반영
+    state = {"store": None, "seed": None, "files": []}
+
+    def competitor(inputs):
+        seed = inputs["Data Fetch"]["competitor_data"]
+        files = [(path, path.stat().st_mtime_ns) for path in iter_snapshot_files(snapshot_dir)]
+        seen = state["files"]
+        if state["store"] is None or seed != state["seed"] or files[:len(seen)] != seen:
+            # 첫 실행, 시드 변경, 기존 파일 수정/삭제/중간 삽입 시에는 처음부터 구성
+            store = build_store(seed_records=seed)
+            new_files = files
+        else:
+            store = state["store"]
+            new_files = files[len(seen):]
+        if new_files:
+            if store is state["store"]:
+                store = store.copy()
+            store.ingest_files([path for path, _ in new_files])
+        state.update(store=store, seed=seed, files=files)
+        return store
+
+    return competitor
+
+
+def make_anomaly_agent():
+    # 오케스트레이터당 감지기를 하나씩 유지 - 새 회차만 흘려보내고, 이력이 바뀐 경우에만 처음부터 재생
+    ingredients = {"detector": None, "months": [], "values": {}, "alerts": deque(maxlen=MAX_ALERTS)}
+    hashtags = {"detector": None, "counts": {}, "alerts": deque(maxlen=MAX_ALERTS)}
+
+    def anomaly(inputs):
+        data = inputs["Data Fetch"]
+        trends = data["historical_data"]["ingredient_trends"]
+        months = [p["month"] for p in next(iter(trends.values()), [])]
+        _advance_ingredients(ingredients, months, {
+            name: [p["mentions"] for p in points] for name, points in trends.items()
+        })
+        _advance_hashtags(hashtags, data["tiktok_data"]["hashtag_trends"])
+        months = ingredients["months"]
+        return {
+            "ingredients": [
+                {**asdict(alert), "month": months[alert.cycle - 1] if alert.cycle <= len(months) else None}
+                for alert in ingredients["alerts"]
+            ],
+            "hashtags": [asdict(alert) for alert in hashtags["alerts"]],
+        }
+
+    return anomaly
+
+
+def _advance_ingredients(state, months, values):
+    seen = len(state["months"])
+    old = state["values"]
+    continued = (
+        state["detector"] is not None
+        and months[:seen] == state["months"]
+        and values.keys() == old.keys()
+        and all(series[:len(old[name])] == old[name] for name, series in values.items())
+    )
+    if continued:
+        # 기존 이력의 연장이면 새 월만 반영 (모든 시계열의 꼬리가 최신 회차로 정렬됨)
+        tails = {name: series[len(old[name]):] for name, series in values.items()}
+        state["alerts"].extend(state["detector"].replay({n: t for n, t in tails.items() if t}))
+    else:
+        state["detector"] = BreakoutDetector()
+        state["alerts"] = deque(state["detector"].replay(values), maxlen=MAX_ALERTS)
+    state["months"] = months
+    state["values"] = values
+
+
+def _advance_hashtags(state, rows):
+    counts = {row["tag"]: row["count"] for row in rows}
+    if state["detector"] is None or counts.keys() != state["counts"].keys():
+        # 해시태그는 현재 언급량 + 성장률만 있으므로 처음에는 (이전, 현재) 2회차 시계열로 구성
+        state["detector"] = BreakoutDetector()
+        state["alerts"] = deque(state["detector"].replay({
+            row["tag"]: [row["count"] / (1 + row["growth"] / 100), row["count"]] for row in rows
+        }), maxlen=MAX_ALERTS)
+    elif counts != state["counts"]:
+        state["alerts"].extend(state["detector"].update(list(counts), list(counts.values())))
+    state["counts"] = counts
+
+
+def build_orchestrator(cache_ttl=600.0, timeout=10.0, snapshot_path=None, shared_cache=None, shared_ttl=None):
+    if shared_cache is not None and shared_cache.lock_timeout >= timeout:
+        # 잠금 대기가 더 길면 대기 중인 레플리카의 에이전트가 먼저 타임아웃됨
+        raise ValueError(f"공유 캐시 잠금 대기({shared_cache.lock_timeout}s)는 에이전트 타임아웃({timeout}s)보다 짧아야 합니다")
+    return Orchestrator([
+        Agent("Data Fetch", make_fetch_agent(snapshot_path, shared_cache, shared_ttl), timeout=timeout, cache_ttl=cache_ttl),
+        Agent("Trend Model", make_trend_agent(shared_cache, shared_ttl), deps=("Data Fetch",), timeout=timeout, cache_ttl=cache_ttl),
+        Agent("Hierarchy", make_hierarchy_agent(shared_cache, shared_ttl), deps=("Data Fetch",), timeout=timeout, cache_ttl=cache_ttl),
+        Agent("Color Analysis", color_agent, deps=("Data Fetch",), timeout=timeout, cache_ttl=cache_ttl),
+        Agent("Competitor", make_competitor_agent(), deps=("Data Fetch",), timeout=timeout, cache_ttl=cache_ttl),
+        Agent("Anomaly", make_anomaly_agent(), deps=("Data Fetch",), timeout=timeout, cache_ttl=cache_ttl),
+    ])
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 이상/급부상 감지 스트림
+성분·해시태그 언급량 시계열에 새 수집 회차가 들어올 때마다 전체 시계열을 벡터 연산으로 평가
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Alert:
+    series: str
+    kind: str           # spike | changepoint | breakout
+    cycle: int
+    value: float        # 이번 회차 언급량
+    growth: float       # 직전 회차 대비 증가율 (0.25 = +25%)
+    score: float        # z-score 또는 CUSUM 누적값
+
+
+class BreakoutDetector:
+    """
+    시계열별 상태는 고정 크기 (증가율 링버퍼 window 개 + 스칼라 몇 개) - 시계열 수에만 비례.
+    - spike: 증가율이 자기 이력(rolling window) 대비 z_threshold 이상
+    - changepoint: 표준화 증가율의 상향 CUSUM 이 cusum_h 초과 (지속적인 추세 전환)
+    - spike / changepoint 는 min_points 회 이상 이력이 쌓이고 증가율이 min_change 이상일 때만.
+      표준편차는 min_std (로그 증가율) 로 하한 - 변동이 거의 없던 시계열의 1% 변화로 z 가 폭주하지 않음
+    - breakout: 같은 회차 전체 시계열 대비 증가율이 이상치 (중앙값/MAD 기반 robust z).
+      비교 대상이 small_group 개 미만이면 MAD 가 불안정하므로, 증가율이 min_growth 이상이면서
+      동료 중앙값의 peer_lead 배 이상인 경우도 포함 (성분 5개 수준의 소규모 그룹)
+    - 모든 알림은 이번 회차 언급량이 min_value 이상인 시계열만 (소량 시계열의 잡음 제외)
+    """
+
+    def __init__(self, window=12, z_threshold=4.0, cusum_k=0.5, cusum_h=8.0,
+                 peer_threshold=3.5, min_points=6, min_peers=5, small_group=30,
+                 min_growth=0.35, peer_lead=1.5, min_std=0.05, min_change=0.1, min_value=20.0, capacity=1024):
+        self.window = window
+        self.z_threshold = z_threshold
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.peer_threshold = peer_threshold
+        self.min_points = min_points
+        self.min_std = min_std
+        self.min_change = min_change
+        self.min_value = min_value
+        self.min_peers = min_peers
+        self.small_group = small_group
+        self.min_growth = min_growth
+        self.peer_lead = peer_lead
+        self.cycle = 0
+        self.names = []
+        self._index = {}
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self._buf = np.zeros((capacity, self.window))
+        self._pos = np.zeros(capacity, dtype=np.int32)
+        self._count = np.zeros(capacity, dtype=np.int32)
+        self._sum = np.zeros(capacity)
+        self._sumsq = np.zeros(capacity)
+        self._cusum = np.zeros(capacity)
+        self._last = np.full(capacity, np.nan)
+
+    def _grow(self, needed):
+        capacity = len(self._pos)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        old = (self._buf, self._pos, self._count, self._sum, self._sumsq, self._cusum, self._last)
+        self._alloc(new_capacity)
+        for dst, src in zip((self._buf, self._pos, self._count, self._sum, self._sumsq, self._cusum, self._last), old):
+            dst[:capacity] = src
+
+    def _ids(self, names):
+        index = self._index
+        ids = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            idx = index.get(name)
+            if idx is None:
+                idx = index[name] = len(self.names)
+                self.names.append(name)
+            ids[i] = idx
+        self._grow(len(self.names))
+        return ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def update(self, names, values):
+        """수집 회차 1회분 반영. names 와 values 는 같은 길이. 같은 이름이 여러 번 오면 합산"""
+        self.cycle += 1
+        ids = self._ids(names)
+        values = np.asarray(values, dtype=float)
+        unique, inverse = np.unique(ids, return_inverse=True)
+        if unique.size < ids.size:
+            # 중복 인덱스로 상태 배열에 쓰면 마지막 값만 남으므로 시계열별로 먼저 합산
+            values = np.bincount(inverse, weights=values, minlength=unique.size)
+            ids = unique
+        level = np.log1p(np.maximum(values, 0.0))
+
+        prev = self._last[ids]
+        has_prev = ~np.isnan(prev)
+        self._last[ids] = level
+        ids, level, values, prev = ids[has_prev], level[has_prev], values[has_prev], prev[has_prev]
+        if ids.size == 0:
+            return []
+        rate = level - prev                     # 로그 증가율
+
+        # 자기 이력 대비 z-score (현재 값 반영 전 rolling 통계)
+        count = self._count[ids]
+        n = np.minimum(count, self.window)
+        safe_n = np.maximum(n, 1)
+        mean = self._sum[ids] / safe_n
+        var = np.maximum(self._sumsq[ids] / safe_n - mean ** 2, 0.0) * safe_n / np.maximum(safe_n - 1, 1)
+        # 조용한 시계열은 표준편차가 0 에 가까워 1% 변화도 z 가 폭주하므로 하한을 둠:
+        # min_std 와 언급량(카운트)의 포아송 잡음이 로그 증가율에 주는 표준편차 중 큰 값
+        counting = np.sqrt(1.0 / (values + 1.0) + np.exp(-prev))      # prev = log(1 + 직전 값)
+        std = np.maximum(np.sqrt(var), np.maximum(counting, self.min_std))
+        warm = n >= self.min_points
+        z = np.where(warm, (rate - mean) / std, 0.0)
+
+        # 상향 CUSUM
+        cusum = np.where(warm, np.maximum(0.0, self._cusum[ids] + z - self.cusum_k), 0.0)
+        changed = (cusum > self.cusum_h) & (rate >= np.log1p(self.min_change))
+        self._cusum[ids] = np.where(changed, 0.0, cusum)
+
+        # 링버퍼 갱신 (window 초과분은 가장 오래된 값 제거)
+        pos = self._pos[ids]
+        evicted = np.where(count >= self.window, self._buf[ids, pos], 0.0)
+        self._buf[ids, pos] = rate
+        self._sum[ids] += rate - evicted
+        self._sumsq[ids] += rate ** 2 - evicted ** 2
+        self._pos[ids] = (pos + 1) % self.window
+        self._count[ids] = count + 1
+
+        # 같은 회차 시계열 간 비교 (robust z)
+        if ids.size >= self.min_peers:
+            median = np.median(rate)
+            mad = np.median(np.abs(rate - median)) * 1.4826 + 1e-6
+            peer_z = (rate - median) / mad
+            breakout = peer_z > self.peer_threshold
+            if ids.size < self.small_group:
+                breakout |= (rate >= np.log1p(self.min_growth)) & (rate >= self.peer_lead * median)
+            breakout &= rate > 0
+        else:
+            peer_z = np.zeros_like(rate)
+            breakout = np.zeros(rate.shape, dtype=bool)
+
+        spike = warm & (z > self.z_threshold) & (rate >= np.log1p(self.min_change))
+        # 언급량이 아주 적은 시계열의 변동(0 → 3 등)은 알림 대상에서 제외
+        audible = values >= self.min_value
+        breakout &= audible
+        spike &= audible
+        changed &= audible
+        growth = np.expm1(rate)
+        alerts = []
+        for kind, mask, score in (("breakout", breakout, peer_z), ("spike", spike, z), ("changepoint", changed, cusum)):
+            for i in np.flatnonzero(mask).tolist():
+                alerts.append(Alert(self.names[ids[i]], kind, self.cycle, float(values[i]),
+                                    float(growth[i]), float(score[i])))
+        return alerts
+
+    def replay(self, series):
+        """
+        {이름: [값, ...]} 이력을 회차 순서대로 흘려보내고 전체 알림 반환.
+        이력이 짧은 시계열은 마지막 값이 최신 회차에 오도록 정렬
+        """
+        length = max((len(v) for v in series.values()), default=0)
+        alerts = []
+        for t in range(length):
+            batch = [(name, values[t - (length - len(values))])
+                     for name, values in series.items() if t >= length - len(values)]
+            alerts.extend(self.update([n for n, _ in batch], [v for _, v in batch]))
+        return alerts
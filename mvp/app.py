@@ -6,13 +6,25 @@ BeautyTrend AI - MVP v3.5 (Enhanced UI)
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from plotly.colors import qualitative
+import os
 import random
-import io
-import base64
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from agents import build_orchestrator
+from datasets import SNAPSHOT_PATH
+from forecasting import advanced_forecast, success_score
+from hierarchy import LEVELS
+from refresh import RefreshScheduler
+import export
+import shared_cache
+
+APP_DIR = Path(__file__).parent
+FAST_START = os.environ.get("BEAUTYTREND_FAST_START", "0") == "1"
 
 # v3.5 - PDF 기능 제거 (Streamlit Cloud 한글 폰트 미지원)
 
@@ -27,311 +39,62 @@ st.set_page_config(
 # ============================================================
 # 향상된 CSS 스타일
 # ============================================================
-st.markdown("""
-<style>
-    /* 전체 배경 */
-    .stApp {
-        background: linear-gradient(180deg, #0f0f1a 0%, #1a1a2e 50%, #16213e 100%);
-    }
-
-    /* 메인 헤더 */
-    .main-header {
-        font-size: 3rem;
-        font-weight: 800;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-align: center;
-        padding: 10px 0;
-        letter-spacing: -0.02em;
-    }
-
-    .sub-header {
-        text-align: center;
-        color: rgba(255,255,255,0.7);
-        font-size: 1.1rem;
-        margin-bottom: 20px;
-    }
-
-    /* 메트릭 카드 스타일 개선 */
-    [data-testid="stMetric"] {
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.15) 0%, rgba(118, 75, 162, 0.15) 100%);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 16px;
-        padding: 20px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.2);
-    }
-
-    [data-testid="stMetricLabel"] {
-        color: rgba(255,255,255,0.8) !important;
-        font-size: 0.9rem !important;
-    }
-
-    [data-testid="stMetricValue"] {
-        color: #fff !important;
-        font-weight: 700 !important;
-    }
+@st.cache_resource
+def load_css():
+    return f"<style>\n{(APP_DIR / 'assets' / 'style.css').read_text(encoding='utf-8')}</style>"
 
-    [data-testid="stMetricDelta"] {
-        color: #10b981 !important;
-    }
-
-    /* 인사이트 박스 */
-    .insight-box {
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
-        border-left: 4px solid #667eea;
-        padding: 20px 25px;
-        border-radius: 0 16px 16px 0;
-        margin: 15px 0;
-        backdrop-filter: blur(10px);
-    }
-
-    .insight-box strong {
-        color: #c4b5fd;
-        font-size: 1.1rem;
-    }
-
-    .insight-box br + * {
-        color: rgba(255,255,255,0.8);
-    }
-
-    /* 에이전트 배지 */
-    .agent-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 8px 16px;
-        border-radius: 25px;
-        font-size: 0.85rem;
-        margin: 5px 3px;
-        font-weight: 500;
-        box-shadow: 0 2px 10px rgba(102, 126, 234, 0.3);
-    }
-
-    /* 섹션 헤더 */
-    .section-header {
-        color: #fff;
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin: 30px 0 20px 0;
-        padding-bottom: 10px;
-        border-bottom: 2px solid rgba(102, 126, 234, 0.3);
-    }
-
-    /* 탭 스타일 */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background: rgba(255,255,255,0.05);
-        padding: 10px;
-        border-radius: 16px;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        background-color: rgba(255,255,255,0.05);
-        border-radius: 12px;
-        padding: 12px 24px;
-        color: rgba(255,255,255,0.7);
-        font-weight: 500;
-    }
-
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
-        color: white !important;
-    }
-
-    /* 사이드바 */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1a1a2e 0%, #16213e 100%);
-        border-right: 1px solid rgba(102, 126, 234, 0.2);
-    }
-
-    [data-testid="stSidebar"] .stMarkdown {
-        color: rgba(255,255,255,0.8);
-    }
-
-    /* 버튼 스타일 */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 12px;
-        padding: 12px 24px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
-    }
-
-    /* 셀렉트박스 */
-    .stSelectbox > div > div {
-        background: rgba(255,255,255,0.05);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 12px;
-    }
-
-    /* 텍스트 인풋 */
-    .stTextInput > div > div > input {
-        background: rgba(255,255,255,0.05);
-        border: 1px solid rgba(102, 126, 234, 0.3);
-        border-radius: 12px;
-        color: white;
-    }
-
-    /* 데이터프레임 */
-    .stDataFrame {
-        background: rgba(255,255,255,0.02);
-        border-radius: 12px;
-        overflow: hidden;
-    }
-
-    /* 구분선 */
-    hr {
-        border-color: rgba(102, 126, 234, 0.2);
-        margin: 30px 0;
-    }
-
-    /* 푸터 스타일 */
-    .footer-container {
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
-        border-radius: 16px;
-        padding: 20px;
-        margin-top: 40px;
-        text-align: center;
-        border: 1px solid rgba(102, 126, 234, 0.2);
-    }
-
-    /* 컬러 카드 */
-    .color-card {
-        border-radius: 12px;
-        padding: 15px;
-        margin: 8px 0;
-        text-align: center;
-        font-weight: 600;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-        transition: transform 0.3s ease;
-    }
-
-    .color-card:hover {
-        transform: scale(1.02);
-    }
-
-    /* 성공/정보/경고 알림 */
-    .stSuccess, .stInfo, .stWarning {
-        border-radius: 12px;
-    }
-
-    /* 스피너 */
-    .stSpinner > div {
-        border-color: #667eea;
-    }
-
-    /* 히든 Streamlit 브랜딩 */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-
-    /* 스크롤바 */
-    ::-webkit-scrollbar {
-        width: 8px;
-        height: 8px;
-    }
-    ::-webkit-scrollbar-track {
-        background: rgba(255,255,255,0.05);
-    }
-    ::-webkit-scrollbar-thumb {
-        background: rgba(102, 126, 234, 0.5);
-        border-radius: 4px;
-    }
-    ::-webkit-scrollbar-thumb:hover {
-        background: rgba(102, 126, 234, 0.7);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # ============================================================
 # 데이터 정의
 # ============================================================
-@st.cache_data
-def load_data():
-    tiktok_data = {
-        "hashtag_trends": [
-            {"tag": "#글래스스킨", "count": 158000, "growth": 245, "region": "Global"},
-            {"tag": "#스킨미니멀리즘", "count": 92000, "growth": 189, "region": "Korea"},
-            {"tag": "#세라마이드", "count": 87000, "growth": 156, "region": "Asia"},
-            {"tag": "#바쿠치올", "count": 65000, "growth": 312, "region": "US"},
-            {"tag": "#펩타이드", "count": 54000, "growth": 178, "region": "Europe"},
-            {"tag": "#슬로우에이징", "count": 48000, "growth": 267, "region": "Global"},
-            {"tag": "#비건뷰티", "count": 42000, "growth": 134, "region": "Europe"},
-            {"tag": "#클린뷰티", "count": 38000, "growth": 98, "region": "US"}
-        ],
-        "ingredient_mentions": [
-            {"name": "세라마이드", "count": 45000, "sentiment_avg": 0.86, "category": "보습"},
-            {"name": "나이아신아마이드", "count": 62000, "sentiment_avg": 0.82, "category": "미백"},
-            {"name": "펩타이드", "count": 38000, "sentiment_avg": 0.88, "category": "안티에이징"},
-            {"name": "바쿠치올", "count": 28000, "sentiment_avg": 0.91, "category": "안티에이징"},
-            {"name": "레티놀", "count": 51000, "sentiment_avg": 0.71, "category": "안티에이징"},
-            {"name": "히알루론산", "count": 72000, "sentiment_avg": 0.85, "category": "보습"},
-            {"name": "비타민C", "count": 68000, "sentiment_avg": 0.79, "category": "미백"},
-            {"name": "스쿠알란", "count": 31000, "sentiment_avg": 0.87, "category": "보습"}
-        ]
-    }
-
-    historical_data = {
-        "ingredient_trends": {
-            "세라마이드": [{"month": f"2025-{i:02d}", "mentions": int(12000 + i*3000 + random.randint(-1000, 1000))} for i in range(1, 13)],
-            "바쿠치올": [{"month": f"2025-{i:02d}", "mentions": int(2000 + i*2500 + random.randint(-500, 500))} for i in range(1, 13)],
-            "펩타이드": [{"month": f"2025-{i:02d}", "mentions": int(8000 + i*2500 + random.randint(-800, 800))} for i in range(1, 13)],
-            "나이아신아마이드": [{"month": f"2025-{i:02d}", "mentions": int(15000 + i*2000 + random.randint(-1000, 1000))} for i in range(1, 13)],
-            "레티놀": [{"month": f"2025-{i:02d}", "mentions": int(20000 + i*1500 + random.randint(-1200, 1200))} for i in range(1, 13)]
-        }
-    }
-
-    color_trends = [
-        {"color": "Soft Pink", "hex": "#FFB6C1", "growth": 45, "season": "S/S 2026"},
-        {"color": "Terracotta", "hex": "#E2725B", "growth": 38, "season": "F/W 2026"},
-        {"color": "Mauve", "hex": "#E0B0FF", "growth": 52, "season": "S/S 2026"},
-        {"color": "Brick Red", "hex": "#CB4154", "growth": 28, "season": "F/W 2026"},
-        {"color": "Nude Beige", "hex": "#F5DEB3", "growth": 61, "season": "All Season"},
-        {"color": "Berry", "hex": "#8E4585", "growth": 33, "season": "F/W 2026"},
-        {"color": "Coral", "hex": "#FF7F50", "growth": 47, "season": "S/S 2026"},
-        {"color": "Dusty Rose", "hex": "#DCAE96", "growth": 55, "season": "All Season"}
-    ]
-
-    competitor_data = [
-        {"brand": "에스티로더", "product": "Advanced Night Repair 3.0", "launch": "2026-02", "category": "세럼", "key_ingredient": "크로노럭신 NEO"},
-        {"brand": "로레알", "product": "Revitalift Laser X5", "launch": "2026-03", "category": "크림", "key_ingredient": "프로-레티놀"},
-        {"brand": "시세이도", "product": "Ultimune Power Infusing 5.0", "launch": "2026-01", "category": "세럼", "key_ingredient": "ImuGeneration RED"},
-        {"brand": "SK-II", "product": "GenOptics Aura Essence 2026", "launch": "2026-04", "category": "에센스", "key_ingredient": "피테라 크리스탈"},
-        {"brand": "랑콤", "product": "Absolue Rich Cream 2026", "launch": "2026-02", "category": "크림", "key_ingredient": "그랑로즈 엑스트랙트"}
-    ]
-
-    return tiktok_data, historical_data, color_trends, competitor_data
-
-tiktok_data, historical_data, color_trends, competitor_data = load_data()
-
-# ============================================================
-# 예측 함수
-# ============================================================
-def advanced_forecast(data, periods=6):
-    values = np.array([d['mentions'] for d in data])
-    n = len(values)
-    x = np.arange(n)
-    z = np.polyfit(x, values, 2)
-    trend = np.poly1d(z)
-    residuals = values - trend(x)
-    seasonal_amplitude = np.std(residuals) * 0.5
-    future_x = np.arange(n, n + periods)
-    predictions = trend(future_x)
-    seasonal = seasonal_amplitude * np.sin(2 * np.pi * future_x / 12)
-    predictions = predictions + seasonal
-    std_error = np.std(residuals)
-    lower = predictions - 1.96 * std_error
-    upper = predictions + 1.96 * std_error
-    return predictions, lower, upper
+REFRESH_INTERVAL = float(os.environ.get("BEAUTYTREND_REFRESH_SECONDS", 600))
+AGENT_TIMEOUT = 10.0
+EXPORT_DIR = Path(os.environ.get("BEAUTYTREND_EXPORT_DIR", Path(tempfile.gettempdir()) / "beautytrend-exports"))
+EXPORT_INLINE_LIMIT = 200 * 1024 * 1024    # 이보다 큰 파일은 다운로드 버튼 대신 경로만 안내
+
+def publish_exports(snapshot):
+    # 스냅샷마다 내보내기 파일을 미리 생성 - 다운로드 시에는 파일만 전달
+    if "Data Fetch" in snapshot.results:
+        # 갱신 주기 두 번 동안 새로 쓰지 않은 다른 프로세스 폴더는 종료된 레플리카의 잔여물로 보고 정리
+        export.publish(snapshot.results, EXPORT_DIR, snapshot.version, max_age=REFRESH_INTERVAL * 2)
+
+@st.cache_resource
+def get_scheduler():
+    # 서버 프로세스당 하나 - 모든 세션이 같은 스냅샷을 읽음
+    # 빠른 시작 모드: 첫 스냅샷은 미리 빌드된 바이너리 데이터에서 로드
+    snapshot_path = SNAPSHOT_PATH if FAST_START and SNAPSHOT_PATH.exists() else None
+    # BEAUTYTREND_CACHE_URL 지정 시 레플리카 간 수집/예측 결과 공유
+    # 잠금 대기는 에이전트 타임아웃의 절반 - 대기하던 레플리카도 시간 안에 직접 계산 가능
+    cache = shared_cache.from_env(lock_timeout=AGENT_TIMEOUT / 2)
+    orchestrator = build_orchestrator(
+        timeout=AGENT_TIMEOUT, snapshot_path=snapshot_path, shared_cache=cache, shared_ttl=REFRESH_INTERVAL
+    )
+    return RefreshScheduler(
+        orchestrator, interval=REFRESH_INTERVAL, shared_cache=cache, on_snapshot=publish_exports
+    ).start()
+
+scheduler = get_scheduler()
+snapshot = scheduler.current()
+agent_run = snapshot.run
+
+if "Data Fetch" not in snapshot.results:
+    st.error(f"데이터 수집 실패: {agent_run.spans['Data Fetch'].error}")
+    st.stop()
+
+datasets = snapshot.results["Data Fetch"]
+tiktok_data = datasets["tiktok_data"]
+historical_data = datasets["historical_data"]
+color_trends = datasets["color_trends"]
+forecasts = snapshot.results.get("Trend Model", {})
+hierarchical = snapshot.results.get("Hierarchy")
+color_analysis = snapshot.results.get("Color Analysis")
+anomaly_alerts = snapshot.results.get("Anomaly", {})
+competitor_store = snapshot.results.get("Competitor")
+if competitor_store is None:
+    # 경쟁사 에이전트 실패 시 기준 카탈로그만으로 표시
+    from competitor import build_store
+    competitor_store = build_store(seed_records=datasets["competitor_data"])
 
 # ============================================================
 # 사이드바
@@ -348,9 +111,47 @@ with st.sidebar:
     st.markdown("---")
 
     st.markdown("##### 🤖 AI 에이전트")
-    agents = ["Orchestrator", "Data Fetch", "Trend Model", "Color Analysis", "Competitor"]
-    for agent in agents:
-        st.markdown(f'<span class="agent-badge">{agent}</span>', unsafe_allow_html=True)
+    status_icons = {"ok": "🟢", "cached": "⚪", "stale": "🟡", "timeout": "🔴", "busy": "🟠", "error": "🔴", "skipped": "⚫"}
+    st.markdown(f'<span class="agent-badge">Orchestrator · {agent_run.elapsed*1000:.0f}ms</span>', unsafe_allow_html=True)
+    for span in agent_run.trace:
+        st.markdown(
+            f'<span class="agent-badge">{status_icons.get(span.status, "")} {span.agent} · {span.duration*1000:.0f}ms</span>',
+            unsafe_allow_html=True
+        )
+    if st.button("🔄 전체 새로고침", use_container_width=True):
+        scheduler.request_refresh()
+        st.toast("백그라운드 갱신을 요청했습니다. 완료 후 새 데이터가 반영됩니다.")
+    refresh_stats = scheduler.stats
+    st.caption(
+        f"스냅샷 v{snapshot.version} · {snapshot.created_at:%H:%M:%S} 갱신 · {snapshot.duration*1000:.0f}ms"
+        + (f" · 평균 {refresh_stats['mean']*1000:.0f}ms / 최대 {refresh_stats['max']*1000:.0f}ms" if refresh_stats['refreshes'] > 1 else "")
+    )
+    if scheduler.shared_cache is not None:
+        cache_stats = scheduler.shared_cache.stats
+        st.caption(f"공유 캐시 · 적중 {cache_stats['hits']} / 대기 후 재사용 {cache_stats['waited']} / 계산 {cache_stats['computed']}")
+    if refresh_stats['last_error']:
+        st.caption(f"⚠️ 최근 갱신 실패: {refresh_stats['last_error']}")
+    with st.expander("📦 데이터 내보내기"):
+        # 표시 이름 → 테이블 (dict 키라 이름이 겹칠 수 없음; format_func 는 AppTest 에서 선택 불가)
+        export_options = {"성분별 예측": "forecasts", "해시태그 집계": "hashtags", "성분 집계": "ingredients", "시뮬레이션 스윕": "simulation", "계층 조정 예측": "hierarchy"}
+        export_table = export_options[st.selectbox("데이터", list(export_options))]
+        export_format = st.radio("형식", export.FORMATS, horizontal=True)
+        export_path = export.published_dir(EXPORT_DIR, snapshot.version) / f"{export_table}{export.EXTENSIONS[export_format]}"
+        if not export_path.exists():
+            st.caption("내보내기 파일 준비 중입니다.")
+        elif export_path.stat().st_size > EXPORT_INLINE_LIMIT:
+            st.caption(f"파일이 커서 화면에서 제공하지 않습니다: `{export_path}`")
+        elif st.button("📦 파일 준비", use_container_width=True):
+            # 요청한 경우에만 파일을 읽어 전달 (매 rerun 마다 읽지 않음)
+            st.download_button(
+                "⬇️ 다운로드", data=export_path.read_bytes(), file_name=export_path.name,
+                mime="text/csv" if export_format == "csv" else "application/octet-stream",
+                use_container_width=True
+            )
+
+    with st.expander("실행 트레이스"):
+        for span in agent_run.trace:
+            st.markdown(f"`{span.agent}` {span.status} {span.duration*1000:.1f}ms" + (f" - {span.error}" if span.error else ""))
 
     st.markdown("---")
 
@@ -413,22 +214,22 @@ with tab1:
     with col1:
         st.markdown('<div class="section-header">🏷️ 해시태그 트렌드 TOP 8</div>', unsafe_allow_html=True)
         df_hashtag = pd.DataFrame(tiktok_data['hashtag_trends'])
-        fig = px.bar(
-            df_hashtag,
-            x='count',
-            y='tag',
+        # plotly.express 대신 graph_objects 사용 (콜드 스타트 시 express import 비용 제거)
+        fig = go.Figure(go.Bar(
+            x=df_hashtag['count'],
+            y=df_hashtag['tag'],
             orientation='h',
-            color='growth',
-            color_continuous_scale='Viridis',
-            hover_data=['region']
-        )
+            customdata=df_hashtag[['growth', 'region']],
+            marker=dict(color=df_hashtag['growth'], coloraxis='coloraxis'),
+            hovertemplate="tag=%{y}<br>count=%{x}<br>growth=%{customdata[0]}<br>region=%{customdata[1]}<extra></extra>"
+        ))
         fig.update_layout(
             height=400,
             yaxis={'categoryorder': 'total ascending'},
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
             font=dict(color='white'),
-            coloraxis_colorbar=dict(title="성장률 %")
+            coloraxis=dict(colorscale='Viridis', colorbar=dict(title="성장률 %"))
         )
         fig.update_xaxes(showgrid=True, gridcolor='rgba(255,255,255,0.1)')
         fig.update_yaxes(showgrid=False)
@@ -437,16 +238,18 @@ with tab1:
     with col2:
         st.markdown('<div class="section-header">🧪 성분별 감성 분석</div>', unsafe_allow_html=True)
         df_ingredient = pd.DataFrame(tiktok_data['ingredient_mentions'])
-        fig = px.scatter(
-            df_ingredient,
-            x='count',
-            y='sentiment_avg',
-            size='count',
-            color='category',
-            hover_name='name',
-            size_max=50,
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
+        fig = go.Figure()
+        sizeref = 2.0 * df_ingredient['count'].max() / (50 ** 2)
+        for i, (cat, group) in enumerate(df_ingredient.groupby('category', sort=False)):
+            fig.add_trace(go.Scatter(
+                x=group['count'], y=group['sentiment_avg'],
+                mode='markers', name=cat, text=group['name'],
+                marker=dict(
+                    size=group['count'], sizemode='area', sizeref=sizeref, sizemin=4,
+                    color=qualitative.Set2[i % len(qualitative.Set2)]
+                ),
+                hovertemplate="<b>%{text}</b><br>count=%{x}<br>sentiment_avg=%{y}<extra></extra>"
+            ))
         fig.update_layout(
             height=400,
             paper_bgcolor='rgba(0,0,0,0)',
@@ -458,6 +261,26 @@ with tab1:
         fig.update_yaxes(title="감성 점수", range=[0.65, 0.95], showgrid=True, gridcolor='rgba(255,255,255,0.1)')
         st.plotly_chart(fig, use_container_width=True)
 
+    st.markdown('<div class="section-header">🚨 급부상 감지 알림</div>', unsafe_allow_html=True)
+    alert_labels = {"breakout": "동종 대비 급부상", "spike": "증가율 급등", "changepoint": "추세 전환"}
+    ingredient_alerts = anomaly_alerts.get("ingredients", [])
+    hashtag_alerts = anomaly_alerts.get("hashtags", [])
+    if ingredient_alerts or hashtag_alerts:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"##### 🧪 성분 ({len(ingredient_alerts)}건)")
+            for alert in sorted(ingredient_alerts, key=lambda a: a['cycle'], reverse=True)[:8]:
+                st.markdown(
+                    f"• **{alert['series']}** {alert['month'] or ''} · {alert_labels[alert['kind']]} "
+                    f"(전월 대비 {alert['growth']*100:+.1f}%, 점수 {alert['score']:.1f})"
+                )
+        with col2:
+            st.markdown(f"##### 🏷️ 해시태그 ({len(hashtag_alerts)}건)")
+            for alert in sorted(hashtag_alerts, key=lambda a: a['score'], reverse=True)[:8]:
+                st.markdown(f"• **{alert['series']}** · {alert_labels[alert['kind']]} (점수 {alert['score']:.1f})")
+    else:
+        st.info("이번 수집 회차에서 감지된 이상 신호가 없습니다.")
+
     st.markdown('<div class="section-header">💡 AI 인사이트</div>', unsafe_allow_html=True)
     col1, col2 = st.columns(2)
     with col1:
@@ -488,18 +311,32 @@ with tab2:
 
     with col1:
         st.markdown("##### 분석 설정")
-        ingredient = st.selectbox("성분 선택", list(historical_data['ingredient_trends'].keys()))
+        modes = ["개별 성분", "계층 조정"] if hierarchical is not None else ["개별 성분"]
+        forecast_mode = st.radio("예측 모드", modes, horizontal=True)
+        if forecast_mode == "계층 조정":
+            level = st.selectbox("집계 수준", LEVELS, index=2)
+            ingredient = st.selectbox("대상 선택", hierarchical.keys(level))
+        else:
+            ingredient = st.selectbox("성분 선택", list(historical_data['ingredient_trends'].keys()))
         forecast_period = st.slider("예측 기간 (개월)", 3, 12, 6)
 
         st.markdown("---")
         st.markdown("##### 📈 분석 정보")
-        st.markdown(f"**선택 성분**: {ingredient}")
+        st.markdown(f"**선택 {'대상' if forecast_mode == '계층 조정' else '성분'}**: {ingredient}")
         st.markdown(f"**예측 기간**: {forecast_period}개월")
 
-    data = historical_data['ingredient_trends'][ingredient]
-    df = pd.DataFrame(data)
-    df['month'] = pd.to_datetime(df['month'])
-    predictions, lower, upper = advanced_forecast(data, forecast_period)
+    if forecast_mode == "계층 조정":
+        # 사전 계산·조정된 계층 예측 조회 (상위 합계 = 하위 합)
+        history, predictions, lower, upper = hierarchical.series(level, ingredient, forecast_period)
+        df = pd.DataFrame({'month': pd.to_datetime(hierarchical.months), 'mentions': history})
+    else:
+        data = historical_data['ingredient_trends'][ingredient]
+        df = pd.DataFrame(data)
+        df['month'] = pd.to_datetime(df['month'])
+        if ingredient in forecasts:
+            predictions, lower, upper = (arr[:forecast_period] for arr in forecasts[ingredient])
+        else:
+            predictions, lower, upper = advanced_forecast(data, forecast_period)
     future_dates = [df['month'].max() + timedelta(days=30*(i+1)) for i in range(forecast_period)]
     current_value = df['mentions'].iloc[-1]
     predicted_value = predictions[-1]
@@ -549,6 +386,21 @@ with tab2:
             st.info("📈 **관심 유지 권장**")
         else:
             st.warning("👀 **시장 관망**")
+        first_alert = next((a for a in anomaly_alerts.get("ingredients", []) if a['series'] == ingredient), None)
+        if first_alert:
+            st.caption(f"🚨 {first_alert['month']} 수집 회차에서 급부상 신호 최초 감지")
+
+    if forecast_mode == "계층 조정" and level != LEVELS[-1]:
+        children = hierarchical.children(level, ingredient)
+        child_level = LEVELS[LEVELS.index(level) + 1]
+        st.markdown(f"##### 🧩 하위 {child_level}별 {forecast_period}개월 후 예측")
+        df_children = pd.DataFrame([
+            {child_level: key, "예측 언급량": round(float(hierarchical.series(child_level, key, forecast_period)[1][-1]))}
+            for key in children
+        ])
+        st.dataframe(df_children, use_container_width=True, hide_index=True)
+        child_total = sum(float(hierarchical.series(child_level, key, forecast_period)[1][-1]) for key in children)
+        st.caption(f"하위 합계 {child_total:,.0f} = {ingredient} 예측 {predicted_value:,.0f} (조정 후 계층 합계 일치)")
 
 # ============================================================
 # TAB 3: 컬러 트렌드
@@ -581,7 +433,8 @@ with tab3:
 
     with col2:
         st.markdown("##### 🔝 TOP 3 트렌드 컬러")
-        for _, row in df_color.nlargest(3, 'growth').iterrows():
+        top_colors = color_analysis["ranked"][:3] if color_analysis else df_color.nlargest(3, 'growth').to_dict('records')
+        for row in top_colors:
             text_color = 'white' if row['hex'] in ['#8E4585', '#CB4154', '#E2725B'] else '#333'
             st.markdown(f"""
             <div class="color-card" style="background: {row['hex']}; color: {text_color};">
@@ -602,22 +455,65 @@ with tab3:
 with tab4:
     st.markdown('<div class="section-header">🏢 경쟁사 신제품 모니터링</div>', unsafe_allow_html=True)
 
-    df_competitor = pd.DataFrame(competitor_data)
+    if "Competitor" not in snapshot.results:
+        st.warning(f"경쟁사 에이전트 응답 없음 - 기준 카탈로그로 표시합니다. ({agent_run.spans['Competitor'].error})")
 
-    # 카드 형식으로 표시
-    cols = st.columns(len(df_competitor))
-    for idx, (_, row) in enumerate(df_competitor.iterrows()):
-        with cols[idx]:
-            st.markdown(f"""
-            <div style="background: rgba(255,255,255,0.05); border-radius: 16px; padding: 20px; text-align: center; border: 1px solid rgba(102, 126, 234, 0.2); height: 200px;">
-                <div style="font-size: 0.8rem; color: rgba(255,255,255,0.5);">{row['launch']}</div>
-                <div style="font-size: 1.1rem; font-weight: 700; color: #fff; margin: 10px 0;">{row['brand']}</div>
-                <div style="font-size: 0.85rem; color: #c4b5fd; margin-bottom: 10px;">{row['product']}</div>
-                <div style="background: rgba(102, 126, 234, 0.2); padding: 5px 10px; border-radius: 20px; display: inline-block; font-size: 0.75rem;">
-                    {row['category']} | {row['key_ingredient']}
+    # 필터
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sel_brand = st.selectbox("브랜드", ["전체"] + competitor_store.values("brand"))
+    with col2:
+        sel_category = st.selectbox("카테고리", ["전체"] + competitor_store.values("category"), key="competitor_category")
+    with col3:
+        sel_ingredient = st.selectbox("핵심 성분", ["전체"] + competitor_store.values("key_ingredient"))
+    with col4:
+        sel_launch = st.selectbox("출시월", ["전체"] + competitor_store.values("launch"))
+
+    results = competitor_store.query(
+        brand=None if sel_brand == "전체" else sel_brand,
+        category=None if sel_category == "전체" else sel_category,
+        key_ingredient=None if sel_ingredient == "전체" else sel_ingredient,
+        launch=None if sel_launch == "전체" else sel_launch,
+    )
+    df_competitor = pd.DataFrame(results, columns=["brand", "product", "launch", "category", "key_ingredient"])
+    df_competitor = df_competitor.sort_values("launch", ascending=False)
+
+    # 카드 형식으로 표시 (최신 출시 5개)
+    if df_competitor.empty:
+        st.info("조건에 맞는 제품이 없습니다.")
+    else:
+        top = df_competitor.head(5)
+        cols = st.columns(len(top))
+        for idx, (_, row) in enumerate(top.iterrows()):
+            with cols[idx]:
+                st.markdown(f"""
+                <div style="background: rgba(255,255,255,0.05); border-radius: 16px; padding: 20px; text-align: center; border: 1px solid rgba(102, 126, 234, 0.2); height: 200px;">
+                    <div style="font-size: 0.8rem; color: rgba(255,255,255,0.5);">{row['launch']}</div>
+                    <div style="font-size: 1.1rem; font-weight: 700; color: #fff; margin: 10px 0;">{row['brand']}</div>
+                    <div style="font-size: 0.85rem; color: #c4b5fd; margin-bottom: 10px;">{row['product']}</div>
+                    <div style="background: rgba(102, 126, 234, 0.2); padding: 5px 10px; border-radius: 20px; display: inline-block; font-size: 0.75rem;">
+                        {row['category']} | {row['key_ingredient']}
+                    </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
+                """, unsafe_allow_html=True)
+        if len(df_competitor) > len(top):
+            with st.expander(f"전체 {len(df_competitor):,}개 제품 보기"):
+                st.dataframe(df_competitor, use_container_width=True, hide_index=True)
+
+    # 직전 스냅샷 대비 변경 사항
+    diff = competitor_store.last_diff
+    st.markdown(f'<div class="section-header">🆕 최근 스냅샷 변경 사항 ({competitor_store.snapshots_ingested}회차)</div>', unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"##### 🚀 신규 출시 {len(diff.new_launches)}건")
+        for row in diff.new_launches[:10]:
+            st.markdown(f"• **{row['brand']}** {row['product']} ({row['launch']}, {row['key_ingredient']})")
+    with col2:
+        st.markdown(f"##### 🔄 성분 변경 {len(diff.ingredient_shifts)}건")
+        for row in diff.ingredient_shifts[:10]:
+            st.markdown(f"• **{row['brand']}** {row['product']}: {row['previous_ingredient']} → {row['key_ingredient']}")
+    if diff.rejected:
+        st.caption(f"⚠️ 출시월 형식 오류로 {len(diff.rejected)}건은 반영하지 않았습니다.")
 
     st.markdown("---")
 
@@ -659,16 +555,9 @@ with tab5:
     with col2:
         if simulate_btn:
             with st.spinner("AI 분석 중..."):
-                import time
                 time.sleep(1)
 
-                base_score = 60
-                ingredient_scores = {"바쿠치올": 25, "펩타이드": 20, "세라마이드": 18, "나이아신아마이드": 15, "레티놀": 10}
-                score = base_score + ingredient_scores.get(main_ingredient, 10)
-                price_adj = {"저가": -5, "중저가": 0, "중가": 5, "중고가": 8, "고가": 5, "프리미엄": 0}
-                score += price_adj.get(price_range, 0)
-                score += random.randint(-5, 5)
-                score = min(max(score, 0), 100)
+                score = success_score(main_ingredient, price_range, noise=random.randint(-5, 5))
 
                 fig = go.Figure(go.Indicator(
                     mode="gauge+number",
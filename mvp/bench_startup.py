@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 콜드 스타트 벤치마크
+새 프로세스에서 앱 첫 렌더링까지 걸리는 시간을 측정 (일반 모드 vs 빠른 시작 모드)
+
+    python bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+
+# 새 인터프리터에서 실행: import → 첫 스크립트 실행(첫 렌더링) 까지 측정
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+t_render = time.perf_counter()
+print(json.dumps({
+    "framework_import": t_import - t0,
+    "first_render": t_render - t_import,
+    "total": t_render - t0,
+    "exceptions": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def probe(fast_start):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(APP_DIR), env.get("PYTHONPATH")]))
+    env["BEAUTYTREND_FAST_START"] = "1" if fast_start else "0"
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, str(APP_DIR / "app.py")],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, fast_start in (("일반 모드", False), ("빠른 시작 모드", True)):
+        samples = [probe(fast_start) for _ in range(args.runs)]
+        errors = [e for s in samples for e in s["exceptions"]]
+        if errors:
+            print(f"[{label}] 렌더링 오류: {errors[0]}")
+            continue
+        render = [s["first_render"] * 1000 for s in samples]
+        total = [s["total"] * 1000 for s in samples]
+        print(
+            f"[{label}] 첫 렌더링 중앙값 {statistics.median(render):7.1f}ms "
+            f"(최소 {min(render):.1f} / 최대 {max(render):.1f}) | "
+            f"프로세스 시작 포함 {statistics.median(total):7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 데이터 소스
+TikTok 해시태그/성분, 성분별 월간 추이, 컬러 트렌드, 경쟁사 신제품
+"""
+
+import pickle
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+SNAPSHOT_PATH = Path(__file__).parent / "data" / "datasets_snapshot.pkl"
+SNAPSHOT_FORMAT = 1
+
+
+def load_data():
+    tiktok_data = {
+        "hashtag_trends": [
+            {"tag": "#글래스스킨", "count": 158000, "growth": 245, "region": "Global"},
+            {"tag": "#스킨미니멀리즘", "count": 92000, "growth": 189, "region": "Korea"},
+            {"tag": "#세라마이드", "count": 87000, "growth": 156, "region": "Asia"},
+            {"tag": "#바쿠치올", "count": 65000, "growth": 312, "region": "US"},
+            {"tag": "#펩타이드", "count": 54000, "growth": 178, "region": "Europe"},
+            {"tag": "#슬로우에이징", "count": 48000, "growth": 267, "region": "Global"},
+            {"tag": "#비건뷰티", "count": 42000, "growth": 134, "region": "Europe"},
+            {"tag": "#클린뷰티", "count": 38000, "growth": 98, "region": "US"}
+        ],
+        "ingredient_mentions": [
+            {"name": "세라마이드", "count": 45000, "sentiment_avg": 0.86, "category": "보습"},
+            {"name": "나이아신아마이드", "count": 62000, "sentiment_avg": 0.82, "category": "미백"},
+            {"name": "펩타이드", "count": 38000, "sentiment_avg": 0.88, "category": "안티에이징"},
+            {"name": "바쿠치올", "count": 28000, "sentiment_avg": 0.91, "category": "안티에이징"},
+            {"name": "레티놀", "count": 51000, "sentiment_avg": 0.71, "category": "안티에이징"},
+            {"name": "히알루론산", "count": 72000, "sentiment_avg": 0.85, "category": "보습"},
+            {"name": "비타민C", "count": 68000, "sentiment_avg": 0.79, "category": "미백"},
+            {"name": "스쿠알란", "count": 31000, "sentiment_avg": 0.87, "category": "보습"}
+        ]
+    }
+
+    historical_data = {
+        "ingredient_trends": {
+            "세라마이드": [{"month": f"2025-{i:02d}", "mentions": int(12000 + i*3000 + random.randint(-1000, 1000))} for i in range(1, 13)],
+            "바쿠치올": [{"month": f"2025-{i:02d}", "mentions": int(2000 + i*2500 + random.randint(-500, 500))} for i in range(1, 13)],
+            "펩타이드": [{"month": f"2025-{i:02d}", "mentions": int(8000 + i*2500 + random.randint(-800, 800))} for i in range(1, 13)],
+            "나이아신아마이드": [{"month": f"2025-{i:02d}", "mentions": int(15000 + i*2000 + random.randint(-1000, 1000))} for i in range(1, 13)],
+            "레티놀": [{"month": f"2025-{i:02d}", "mentions": int(20000 + i*1500 + random.randint(-1200, 1200))} for i in range(1, 13)]
+        }
+    }
+
+    color_trends = [
+        {"color": "Soft Pink", "hex": "#FFB6C1", "growth": 45, "season": "S/S 2026"},
+        {"color": "Terracotta", "hex": "#E2725B", "growth": 38, "season": "F/W 2026"},
+        {"color": "Mauve", "hex": "#E0B0FF", "growth": 52, "season": "S/S 2026"},
+        {"color": "Brick Red", "hex": "#CB4154", "growth": 28, "season": "F/W 2026"},
+        {"color": "Nude Beige", "hex": "#F5DEB3", "growth": 61, "season": "All Season"},
+        {"color": "Berry", "hex": "#8E4585", "growth": 33, "season": "F/W 2026"},
+        {"color": "Coral", "hex": "#FF7F50", "growth": 47, "season": "S/S 2026"},
+        {"color": "Dusty Rose", "hex": "#DCAE96", "growth": 55, "season": "All Season"}
+    ]
+
+    competitor_data = [
+        {"brand": "에스티로더", "product": "Advanced Night Repair 3.0", "launch": "2026-02", "category": "세럼", "key_ingredient": "크로노럭신 NEO"},
+        {"brand": "로레알", "product": "Revitalift Laser X5", "launch": "2026-03", "category": "크림", "key_ingredient": "프로-레티놀"},
+        {"brand": "시세이도", "product": "Ultimune Power Infusing 5.0", "launch": "2026-01", "category": "세럼", "key_ingredient": "ImuGeneration RED"},
+        {"brand": "SK-II", "product": "GenOptics Aura Essence 2026", "launch": "2026-04", "category": "에센스", "key_ingredient": "피테라 크리스탈"},
+        {"brand": "랑콤", "product": "Absolue Rich Cream 2026", "launch": "2026-02", "category": "크림", "key_ingredient": "그랑로즈 엑스트랙트"}
+    ]
+
+    return tiktok_data, historical_data, color_trends, competitor_data
+
+
+# ============================================================
+# 바이너리 스냅샷 (빠른 시작 모드)
+# 현재 load_data() 는 모의 데이터라 스냅샷 로드와 속도 차이가 없음 (둘 다 수십 µs).
+# 실제 수집(API 호출 등)으로 바뀌었을 때 첫 화면을 막지 않기 위한 연결 지점이며,
+# 빠른 시작 모드에서도 스냅샷은 첫 회차에만 쓰이고 이후 갱신은 실제 수집
+# ============================================================
+def save_snapshot(path=SNAPSHOT_PATH):
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "datasets": load_data(),
+    }
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+    return path
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """미리 빌드된 스냅샷을 읽음. 없거나 형식이 다르면 None"""
+    try:
+        with Path(path).open("rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if payload.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return payload["datasets"]
+
+
+if __name__ == "__main__":
+    # python datasets.py [경로] - 스냅샷 재빌드
+    print(save_snapshot(*sys.argv[1:2]))
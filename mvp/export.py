@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 대량 내보내기
+예측(개별/계층 조정), 해시태그/성분 집계, 시뮬레이션 스윕을 Parquet / Arrow / CSV 로 청크 단위 스트리밍 저장
+
+    python export.py <출력 폴더>                    # 현재 데이터 내보내기
+    python export.py <출력 폴더> --bench 100000     # 합성 시계열 N개로 속도 측정
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import secrets
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from forecasting import INGREDIENT_SCORES, PRICE_ADJ, batch_forecast, success_score
+
+FORMATS = ("parquet", "arrow", "csv")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+CHUNK_SERIES = 10_000
+CHUNK_ROWS = 100_000
+
+
+# ============================================================
+# 저장 (청크 단위, 메모리 사용량은 청크 크기에만 비례)
+# ============================================================
+class _CsvSink:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._header = False
+
+    def write(self, chunk):
+        if not self._header:
+            self._writer.writerow(chunk.keys())
+            self._header = True
+        columns = [col.tolist() if isinstance(col, np.ndarray) else col for col in chunk.values()]
+        self._writer.writerows(zip(*columns))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+        self._pq = pq
+        self._path = path
+        self._writer = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        table = pa.Table.from_pydict(chunk)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema, compression="zstd")
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _ArrowSink:
+    def __init__(self, path):
+        self._path = path
+        self._sink = None
+        self._writer = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        batch = pa.RecordBatch.from_pydict(chunk)
+        if self._writer is None:
+            self._sink = pa.OSFile(str(self._path), "wb")
+            self._writer = pa.ipc.new_file(self._sink, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+
+
+SINKS = {"parquet": _ParquetSink, "arrow": _ArrowSink, "csv": _CsvSink}
+
+
+def write_chunks(chunks, path, fmt):
+    """청크(컬럼명 → 배열) 이터레이터를 파일 하나로 저장하고 행 수 반환. 임시 파일 후 교체"""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    sink = SINKS[fmt](tmp)
+    rows = 0
+    try:
+        try:
+            for chunk in chunks:
+                sink.write(chunk)
+                rows += len(next(iter(chunk.values())))
+        finally:
+            sink.close()
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if rows == 0:
+        tmp.unlink(missing_ok=True)
+        return 0
+    tmp.replace(path)
+    return rows
+
+
+# ============================================================
+# 청크 생성
+# ============================================================
+def add_months(month, k):
+    year, mon = map(int, month.split("-"))
+    total = year * 12 + mon - 1 + k
+    return f"{total // 12}-{total % 12 + 1:02d}"
+
+
+def series_chunks(trends, chunk_series=CHUNK_SERIES):
+    """{이름: [{"month", "mentions"}, ...]} → (이름 배열, 마지막 월, 값 행렬) 청크. 길이·종료월이 같은 것끼리 묶음"""
+    groups = {}
+    for name, points in trends.items():
+        groups.setdefault((len(points), points[-1]["month"]), []).append(name)
+    for (_, last_month), names in groups.items():
+        for start in range(0, len(names), chunk_series):
+            batch = names[start:start + chunk_series]
+            matrix = np.array([[p["mentions"] for p in trends[name]] for name in batch], dtype=float)
+            yield np.array(batch, dtype=object), last_month, matrix
+
+
+def forecast_chunks(chunks, periods=12):
+    steps = np.arange(1, periods + 1)
+    for names, last_month, matrix in chunks:
+        predictions, lower, upper = batch_forecast(matrix, periods)
+        months = np.array([add_months(last_month, int(k)) for k in steps], dtype=object)
+        yield {
+            "series": np.repeat(names, periods),
+            "step": np.tile(steps, len(names)),
+            "month": np.tile(months, len(names)),
+            "prediction": predictions.ravel(),
+            "lower": lower.ravel(),
+            "upper": upper.ravel(),
+        }
+
+
+def record_chunks(records, chunk_rows=CHUNK_ROWS):
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, chunk_rows))
+        if not batch:
+            return
+        yield {key: [row.get(key) for row in batch] for key in batch[0]}
+
+
+def simulation_sweep(categories=("세럼", "크림", "에센스", "토너", "마스크팩")):
+    # 시뮬레이션 탭의 입력 조합 전체 (노이즈 제외 기준 점수)
+    for category, ingredient, price in itertools.product(categories, INGREDIENT_SCORES, PRICE_ADJ):
+        score = success_score(ingredient, price)
+        yield {
+            "category": category,
+            "main_ingredient": ingredient,
+            "price_range": price,
+            "score": score,
+            "estimated_revenue": score * 50,
+        }
+
+
+def hierarchy_chunks(forecast, chunk_nodes=CHUNK_SERIES):
+    """계층 조정 예측 (HierarchicalForecast) → 노드 × 기간 행"""
+    periods = forecast.reconciled.shape[1]
+    steps = np.arange(1, periods + 1)
+    months = np.array([add_months(forecast.months[-1], int(k)) for k in steps], dtype=object)
+    for start in range(0, len(forecast.nodes), chunk_nodes):
+        nodes = forecast.nodes[start:start + chunk_nodes]
+        rows = slice(start, start + len(nodes))
+        yield {
+            "level": np.repeat(np.array([n["level"] for n in nodes], dtype=object), periods),
+            "key": np.repeat(np.array([n["key"] for n in nodes], dtype=object), periods),
+            "step": np.tile(steps, len(nodes)),
+            "month": np.tile(months, len(nodes)),
+            "base": forecast.base[rows].ravel(),
+            "reconciled": forecast.reconciled[rows].ravel(),
+            "lower": forecast.lower[rows].ravel(),
+            "upper": forecast.upper[rows].ravel(),
+        }
+
+
+def snapshot_tables(results, periods=12):
+    """스냅샷 결과 → {테이블명: 청크 이터레이터 생성 함수}"""
+    data = results["Data Fetch"]
+    trends = data["historical_data"]["ingredient_trends"]
+    tables = {
+        "forecasts": lambda: forecast_chunks(series_chunks(trends), periods),
+        "hashtags": lambda: record_chunks(data["tiktok_data"]["hashtag_trends"]),
+        "ingredients": lambda: record_chunks(data["tiktok_data"]["ingredient_mentions"]),
+        "simulation": lambda: record_chunks(simulation_sweep()),
+    }
+    if results.get("Hierarchy") is not None:
+        tables["hierarchy"] = lambda: hierarchy_chunks(results["Hierarchy"])
+    return tables
+
+
+def export_tables(tables, out_dir, formats=FORMATS):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for name, make_chunks in tables.items():
+        for fmt in formats:
+            started = time.perf_counter()
+            path = out_dir / f"{name}{EXTENSIONS[fmt]}"
+            rows = write_chunks(make_chunks(), path, fmt)
+            manifest.append({
+                "table": name, "format": fmt, "path": path, "rows": rows,
+                "seconds": time.perf_counter() - started,
+            })
+    return manifest
+
+
+# 같은 호스트의 여러 레플리카가 root 를 공유해도 폴더/임시 파일이 겹치지 않도록 프로세스별 하위 폴더 사용
+PROCESS_TAG = f"{os.getpid()}-{secrets.token_hex(4)}"
+
+
+def published_dir(root, version):
+    return Path(root) / PROCESS_TAG / f"v{version}"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True         # 다른 사용자 프로세스 등 - 살아 있는 것으로 간주
+    return True
+
+
+def prune_process_dirs(root, max_age=None):
+    """
+    다른 프로세스 폴더 중 프로세스가 종료됐거나 max_age 초 넘게 갱신되지 않은 것 삭제
+    (재시작/재배포 후 남은 폴더 정리). 살아 있는 레플리카는 갱신마다 폴더를 새로 쓰므로 유지됨
+    """
+    now = time.time()
+    for folder in Path(root).glob("*-*"):
+        if folder.name == PROCESS_TAG or not folder.is_dir():
+            continue
+        pid = folder.name.split("-", 1)[0]
+        try:
+            stale = max_age is not None and folder.stat().st_mtime + max_age < now
+        except FileNotFoundError:
+            continue
+        if stale or (pid.isdigit() and not _pid_alive(int(pid))):
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+def publish(results, root, version, formats=FORMATS, max_age=None):
+    """
+    root/<프로세스>/v{version} 에 내보내기 파일 생성 후 이 프로세스의 이전 버전 폴더와
+    종료된/오래된 다른 프로세스 폴더 정리
+    """
+    target = published_dir(root, version)
+    manifest = export_tables(snapshot_tables(results), target, formats)
+    for old in target.parent.glob("v*"):
+        if old != target and old.is_dir():
+            shutil.rmtree(old, ignore_errors=True)
+    prune_process_dirs(root, max_age)
+    return manifest
+
+
+# ============================================================
+# 벤치마크용 합성 시계열
+# ============================================================
+def synthetic_series_chunks(n_series, n_points=12, chunk_series=CHUNK_SERIES, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n_points)
+    for start in range(0, n_series, chunk_series):
+        size = min(chunk_series, n_series - start)
+        base = rng.uniform(1_000, 50_000, (size, 1))
+        slope = rng.uniform(-500, 3_000, (size, 1))
+        matrix = base + slope * x + rng.normal(0, 800, (size, n_points))
+        names = np.array([f"series-{i:06d}" for i in range(start, start + size)], dtype=object)
+        yield names, "2025-12", matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BeautyTrend AI 데이터 내보내기")
+    parser.add_argument("out_dir")
+    parser.add_argument("--format", choices=FORMATS, action="append")
+    parser.add_argument("--bench", type=int, metavar="N", help="합성 시계열 N개 예측 내보내기")
+    args = parser.parse_args()
+    formats = args.format or list(FORMATS)
+
+    if args.bench:
+        tables = {"forecasts": lambda: forecast_chunks(synthetic_series_chunks(args.bench))}
+    else:
+        from agents import fetch_agent, hierarchy_agent
+        results = {"Data Fetch": fetch_agent({})}
+        results["Hierarchy"] = hierarchy_agent(results)
+        tables = snapshot_tables(results)
+    for item in export_tables(tables, args.out_dir, formats):
+        print(f"{item['table']:<12} {item['format']:<8} {item['rows']:>10,}행 {item['seconds']:7.2f}s  {item['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 트렌드 예측 모델 / 신제품 시뮬레이션 점수
+"""
+
+import numpy as np
+
+
+def advanced_forecast(data, periods=6):
+    values = np.array([d['mentions'] for d in data])
+    n = len(values)
+    x = np.arange(n)
+    z = np.polyfit(x, values, 2)
+    trend = np.poly1d(z)
+    residuals = values - trend(x)
+    seasonal_amplitude = np.std(residuals) * 0.5
+    future_x = np.arange(n, n + periods)
+    predictions = trend(future_x)
+    seasonal = seasonal_amplitude * np.sin(2 * np.pi * future_x / 12)
+    predictions = predictions + seasonal
+    std_error = np.std(residuals)
+    lower = predictions - 1.96 * std_error
+    upper = predictions + 1.96 * std_error
+    return predictions, lower, upper
+
+
+def batch_forecast(values, periods=6):
+    """
+    advanced_forecast 의 다중 시계열 버전.
+    values: (시계열 수, 관측 수) 행렬 → (예측, 하한, 상한) 각각 (시계열 수, periods)
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[1]
+    x = np.arange(n)
+    design = np.vander(x, 3)                                    # [x², x, 1]
+    coef, *_ = np.linalg.lstsq(design, values.T, rcond=None)    # (3, 시계열 수)
+    residuals = values - (design @ coef).T
+    std_error = residuals.std(axis=1, keepdims=True)
+    future_x = np.arange(n, n + periods)
+    predictions = (np.vander(future_x, 3) @ coef).T
+    predictions = predictions + std_error * 0.5 * np.sin(2 * np.pi * future_x / 12)
+    return predictions, predictions - 1.96 * std_error, predictions + 1.96 * std_error
+
+
+# ============================================================
+# 신제품 성공 시뮬레이션
+# ============================================================
+BASE_SCORE = 60
+INGREDIENT_SCORES = {"바쿠치올": 25, "펩타이드": 20, "세라마이드": 18, "나이아신아마이드": 15, "레티놀": 10}
+PRICE_ADJ = {"저가": -5, "중저가": 0, "중가": 5, "중고가": 8, "고가": 5, "프리미엄": 0}
+
+
+def success_score(main_ingredient, price_range, noise=0):
+    score = BASE_SCORE + INGREDIENT_SCORES.get(main_ingredient, 10)
+    score += PRICE_ADJ.get(price_range, 0)
+    score += noise
+    return min(max(score, 0), 100)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 계층 예측 (전체 → 카테고리 → 성분 → 지역)
+모든 수준을 한 번에 예측한 뒤 희소 합산 행렬로 조정해 상위 합계 = 하위 합이 되도록 보정
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, cg
+
+from forecasting import batch_forecast
+
+LEVELS = ("전체", "카테고리", "성분", "지역")
+TOTAL_KEY = "전체"
+CG_RTOL = 1e-10             # 켤레 기울기법 상대 허용 오차 (절대 허용 오차는 0)
+
+
+def region_shares(ingredients, hashtag_trends, boost=2.0):
+    """
+    성분별 지역 비중. 해시태그 지역별 언급량을 기본 비중으로 하고,
+    성분명 해시태그(#바쿠치올 등)가 있는 지역은 boost 배 가중
+    """
+    regions = list(dict.fromkeys(row["region"] for row in hashtag_trends))
+    base = np.array([sum(r["count"] for r in hashtag_trends if r["region"] == region) for region in regions], dtype=float)
+    shares = np.tile(base, (len(ingredients), 1))
+    for i, name in enumerate(ingredients):
+        for row in hashtag_trends:
+            if row["tag"].lstrip("#") == name:
+                shares[i, regions.index(row["region"])] *= boost
+    return regions, shares / shares.sum(axis=1, keepdims=True)
+
+
+@dataclass
+class Hierarchy:
+    nodes: list                 # [{"level", "key", "category", "ingredient", "region"}, ...] 위에서 아래 순서
+    summing: sparse.csr_matrix  # (노드 수, 최하위 노드 수) 합산 행렬 S
+    bottom: np.ndarray          # (최하위 노드 수, 관측 수)
+    months: list
+
+    @property
+    def history(self):
+        return np.asarray(self.summing @ self.bottom)
+
+    def forecast(self, periods=12, method="wls"):
+        """
+        전 노드 일괄 예측 후 조정:  ỹ = S (Sᵀ W⁻¹ S)⁻¹ Sᵀ W⁻¹ ŷ
+        method="wls" - W = 노드별 하위 노드 수 (구조적 가중), "ols" - W = I
+        """
+        history = self.history
+        base, lower, upper = batch_forecast(history, periods)
+        S = self.summing
+        if method == "wls":
+            weights = 1.0 / np.asarray(S.sum(axis=1)).ravel()
+        elif method == "ols":
+            weights = np.ones(S.shape[0])
+        else:
+            raise ValueError(f"지원하지 않는 조정 방식: {method}")
+        # SᵀW⁻¹S 는 '전체' 행 때문에 밀집 행렬이 되므로 만들지 않고 희소 곱으로만 풀이 (켤레 기울기법)
+        StW = (S.T @ sparse.diags(weights)).tocsr()
+        n_bottom = S.shape[1]
+        normal = LinearOperator((n_bottom, n_bottom), matvec=lambda x: StW @ (S @ x), dtype=float)
+        jacobi = sparse.diags(1.0 / np.asarray(StW.sum(axis=1)).ravel())
+        rhs = np.asarray(StW @ base)
+        start = base[-n_bottom:]            # 최하위 노드 기본 예측에서 출발
+        bottom = np.empty((n_bottom, periods))
+        for h in range(periods):
+            bottom[:, h], _ = cg(normal, rhs[:, h], x0=start[:, h], M=jacobi, tol=CG_RTOL, atol=0.0)
+        # 조정값은 항상 S·(최하위 예측) 이므로 상위 합계 = 하위 합이 정확히 성립
+        reconciled = np.asarray(S @ bottom)
+        # 구간 폭은 노드별 기본 예측 오차를 그대로 유지
+        half_width = (upper - lower) / 2
+        return HierarchicalForecast(
+            nodes=self.nodes,
+            months=self.months,
+            history=history,
+            base=base,
+            reconciled=reconciled,
+            lower=reconciled - half_width,
+            upper=reconciled + half_width,
+            summing=S,
+        )
+
+
+@dataclass
+class HierarchicalForecast:
+    nodes: list
+    months: list
+    history: np.ndarray
+    base: np.ndarray
+    reconciled: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    summing: sparse.csr_matrix
+
+    def __post_init__(self):
+        self._index = {(node["level"], node["key"]): i for i, node in enumerate(self.nodes)}
+
+    def keys(self, level):
+        return [node["key"] for node in self.nodes if node["level"] == level]
+
+    def index(self, level, key):
+        return self._index[(level, key)]
+
+    def series(self, level, key, periods=None):
+        """(이력, 조정 예측, 하한, 상한) - periods 지정 시 앞 n개월만"""
+        i = self.index(level, key)
+        end = periods or self.reconciled.shape[1]
+        return self.history[i], self.reconciled[i, :end], self.lower[i, :end], self.upper[i, :end]
+
+    def children(self, level, key):
+        parent = self.nodes[self.index(level, key)]
+        child_level = LEVELS[LEVELS.index(level) + 1] if level != LEVELS[-1] else None
+        if child_level is None:
+            return []
+        field = {"전체": None, "카테고리": "category", "성분": "ingredient"}[level]
+        return [
+            node["key"] for node in self.nodes
+            if node["level"] == child_level and (field is None or node[field] == parent[field])
+        ]
+
+    def coherence_gap(self, reconciled=True):
+        """상위 노드 예측과 하위 합의 최대 차이 (조정 후에는 수치 오차 수준)"""
+        values = self.reconciled if reconciled else self.base
+        bottom_rows = [i for i, node in enumerate(self.nodes) if node["level"] == LEVELS[-1]]
+        return float(np.abs(self.summing @ values[bottom_rows] - values).max())
+
+
+def build_hierarchy(trends, ingredient_mentions, hashtag_trends):
+    """
+    trends: {성분: [{"month", "mentions"}, ...]}  (성분 수준 실측)
+    ingredient_mentions: 성분 → 카테고리 매핑 출처
+    hashtag_trends: 지역 비중 출처
+    """
+    ingredients = list(trends)
+    months = [p["month"] for p in trends[ingredients[0]]]
+    category_of = {row["name"]: row["category"] for row in ingredient_mentions}
+    categories = list(dict.fromkeys(category_of.get(name, "기타") for name in ingredients))
+    regions, shares = region_shares(ingredients, hashtag_trends)
+
+    values = np.array([[p["mentions"] for p in trends[name]] for name in ingredients], dtype=float)
+    bottom = (values[:, None, :] * shares[:, :, None]).reshape(len(ingredients) * len(regions), -1)
+
+    nodes = [{"level": "전체", "key": TOTAL_KEY, "category": None, "ingredient": None, "region": None}]
+    nodes += [{"level": "카테고리", "key": c, "category": c, "ingredient": None, "region": None} for c in categories]
+    nodes += [
+        {"level": "성분", "key": name, "category": category_of.get(name, "기타"), "ingredient": name, "region": None}
+        for name in ingredients
+    ]
+    nodes += [
+        {"level": "지역", "key": f"{name} · {region}", "category": category_of.get(name, "기타"),
+         "ingredient": name, "region": region}
+        for name in ingredients for region in regions
+    ]
+
+    # 합산 행렬: 최하위(성분×지역) 노드마다 자신과 상위 노드(성분, 카테고리, 전체) 행에 1
+    n_bottom = len(bottom)
+    row_of = {(node["level"], node["key"]): i for i, node in enumerate(nodes)}
+    leaf_ingredient = np.repeat(np.arange(len(ingredients)), len(regions))
+    ingredient_rows = np.array([row_of[("성분", name)] for name in ingredients])[leaf_ingredient]
+    category_rows = np.array([row_of[("카테고리", category_of.get(name, "기타"))] for name in ingredients])[leaf_ingredient]
+    leaf_rows = np.arange(len(nodes) - n_bottom, len(nodes))
+    rows = np.concatenate([np.zeros(n_bottom, dtype=int), category_rows, ingredient_rows, leaf_rows])
+    cols = np.tile(np.arange(n_bottom), 4)
+    summing = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(nodes), n_bottom)
+    )
+    return Hierarchy(nodes=nodes, summing=summing, bottom=bottom, months=months)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - Multi-Agent 오케스트레이터
+에이전트 의존 그래프를 스레드 풀에서 동시 실행하고 결과를 큐로 전달
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass(frozen=True)
+class Agent:
+    name: str
+    fn: Callable[[dict], Any]   # fn(inputs) - inputs: {의존 에이전트 이름: 결과}
+    deps: tuple = ()
+    timeout: float = 10.0       # 초
+    cache_ttl: float = 0.0      # 초, 0 이면 캐시 안 함
+
+
+@dataclass
+class Span:
+    agent: str
+    status: str                 # ok | cached | stale | timeout | busy | error | skipped
+    started: float = 0.0
+    finished: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def duration(self):
+        return max(self.finished - self.started, 0.0)
+
+
+@dataclass
+class RunResult:
+    results: dict
+    trace: list
+    started: float
+    finished: float
+    forced: bool = False
+    spans: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.spans = {span.agent: span for span in self.trace}
+
+    @property
+    def elapsed(self):
+        return self.finished - self.started
+
+    @property
+    def ok(self):
+        return all(span.status in ("ok", "cached", "stale") for span in self.trace)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    version: int
+    token: tuple
+    expires: float
+
+
+class Orchestrator:
+    """
+    에이전트 그래프 실행기.
+    - 의존성이 충족된 에이전트는 즉시 스레드 풀에 제출 (동시 실행)
+    - 완료된 결과는 실행별 큐로 수집되어 후속 에이전트의 입력이 됨
+    - 에이전트별 타임아웃 초과 시 이전 결과(stale)로 대체, 없으면 후속 에이전트 생략
+    - 타임아웃으로 버려진 호출이 아직 실행 중이면 재제출하지 않고 busy 처리 (워커 누수 방지)
+    - 결과 캐시는 TTL + 입력 버전 기준 (상위 결과가 바뀌면 자동 무효화)
+    """
+
+    def __init__(self, agents, max_workers=None, trace_history=50):
+        self.agents = {agent.name: agent for agent in agents}
+        for agent in agents:
+            missing = [d for d in agent.deps if d not in self.agents]
+            if missing:
+                raise ValueError(f"{agent.name}: 알 수 없는 의존 에이전트 {missing}")
+        self.order = self._topological_order()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(self.agents) * 2,
+            thread_name_prefix="agent",
+        )
+        self._cache = {}
+        self._inflight = {}     # name -> (Future, 시작 시각) - 이전 실행에서 끝나지 않은 호출
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self.runs = deque(maxlen=trace_history)
+
+    def _topological_order(self):
+        order, state = [], {}
+
+        def visit(name):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"순환 의존성 감지: {name}")
+            state[name] = "visiting"
+            for dep in self.agents[name].deps:
+                visit(dep)
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.agents:
+            visit(name)
+        return order
+
+    # ---------------- 캐시 ----------------
+    def _cached(self, name, token, now, allow_stale=False):
+        entry = self._cache.get(name)
+        if entry is None:
+            return None
+        if allow_stale or (entry.token == token and entry.expires > now):
+            return entry
+        return None
+
+    def _store(self, name, value, token):
+        ttl = self.agents[name].cache_ttl
+        entry = _CacheEntry(value, next(self._versions), token, time.monotonic() + ttl)
+        self._cache[name] = entry
+        return entry
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    # ---------------- 실행 ----------------
+    @staticmethod
+    def _call(agent, inputs, outbox):
+        started = time.perf_counter()
+        try:
+            value = agent.fn(inputs)
+            outbox.put((agent.name, "ok", value, started, time.perf_counter()))
+        except Exception as exc:  # 에이전트 오류는 트레이스에 기록
+            outbox.put((agent.name, "error", exc, started, time.perf_counter()))
+
+    def run(self, force=False):
+        """그래프 전체 실행. force=True 이면 캐시를 무시하고 모든 에이전트 재계산"""
+        with self._lock:
+            return self._run(force)
+
+    def _run(self, force):
+        run_started = time.perf_counter()
+        outbox = queue.Queue()
+        pending = set(self.order)
+        running = {}            # name -> (deadline, started)
+        entries = {}            # name -> _CacheEntry (이번 실행에서 확정된 결과)
+        failed = set()
+        trace = []
+
+        def dispatch():
+            for name in [n for n in self.order if n in pending]:
+                agent = self.agents[name]
+                if any(d in failed for d in agent.deps):
+                    pending.discard(name)
+                    failed.add(name)
+                    now = time.perf_counter()
+                    trace.append(Span(name, "skipped", now, now, "상위 에이전트 실패"))
+                    continue
+                if not all(d in entries for d in agent.deps):
+                    continue
+                pending.discard(name)
+                token = tuple(entries[d].version for d in agent.deps)
+                if not force and agent.cache_ttl > 0:
+                    hit = self._cached(name, token, time.monotonic())
+                    if hit is not None:
+                        entries[name] = hit
+                        now = time.perf_counter()
+                        trace.append(Span(name, "cached", now, now))
+                        continue
+                started = time.perf_counter()
+                previous = self._inflight.get(name)
+                if previous is not None and not previous[0].done():
+                    give_up(name, "busy", started, started, f"이전 호출 실행 중 ({started - previous[1]:.1f}s 경과)")
+                    continue
+                inputs = {d: entries[d].value for d in agent.deps}
+                running[name] = (started + agent.timeout, started, token)
+                future = self._executor.submit(self._call, agent, inputs, outbox)
+                self._inflight[name] = (future, started)
+
+        def give_up(name, status, started, finished, error):
+            stale = self._cached(name, None, 0, allow_stale=True)
+            if stale is not None:
+                entries[name] = stale
+                trace.append(Span(name, "stale", started, finished, f"{status}: {error}"))
+            else:
+                failed.add(name)
+                trace.append(Span(name, status, started, finished, error))
+
+        dispatch()
+        while running:
+            now = time.perf_counter()
+            wait = max(min(deadline for deadline, _, _ in running.values()) - now, 0.0)
+            try:
+                name, status, value, started, finished = outbox.get(timeout=wait)
+            except queue.Empty:
+                now = time.perf_counter()
+                for name in [n for n, (deadline, _, _) in running.items() if deadline <= now]:
+                    _, started, _ = running.pop(name)
+                    give_up(name, "timeout", started, now, f"{self.agents[name].timeout:.1f}s 초과")
+                dispatch()
+                continue
+            if name not in running:
+                continue
+            _, _, token = running.pop(name)
+            if status == "ok":
+                entries[name] = self._store(name, value, token)
+                trace.append(Span(name, "ok", started, finished))
+            else:
+                give_up(name, "error", started, finished, repr(value))
+            dispatch()
+
+        result = RunResult(
+            results={name: entry.value for name, entry in entries.items()},
+            trace=sorted(trace, key=lambda span: self.order.index(span.agent)),
+            started=run_started,
+            finished=time.perf_counter(),
+            forced=force,
+        )
+        self.runs.append(result)
+        return result
+
+    @property
+    def last_run(self):
+        return self.runs[-1] if self.runs else None
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
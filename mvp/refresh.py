@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 백그라운드 갱신 스케줄러
+주기적으로 에이전트 그래프를 재실행하고 불변 스냅샷을 원자적으로 교체
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, is_dataclass, replace
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    created_at: datetime
+    results: Mapping[str, Any]
+    run: Any                # orchestrator.RunResult (results 는 위 results 와 같은 읽기 전용 매핑)
+    duration: float         # 갱신 소요 시간 (초)
+
+
+def _freeze(value):
+    # 세션 간 공유 데이터가 실수로 변경되지 않도록 재귀적으로 읽기 전용 변환
+    # (dict → MappingProxyType, list/tuple → tuple, set → frozenset, ndarray → 쓰기 금지 뷰,
+    #  dataclass → 필드를 변환한 복사본). 그 외 객체(CompetitorStore 등)는 읽기 전용 관례로 공유
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return replace(value, **{f.name: _freeze(getattr(value, f.name)) for f in fields(value) if f.init})
+    return value
+
+
+class RefreshScheduler:
+    """
+    - refresh(): 오케스트레이터 실행 (주기 갱신은 TTL 캐시 사용, 수동 요청 시 전체 재계산) → 새 스냅샷 → 참조 교체
+    - current(): 잠금 없이 현재 스냅샷 반환 (진행 중인 rerun 은 기존 스냅샷을 계속 사용)
+    - 갱신은 전용 데몬 스레드에서만 수행되어 세션 스크립트를 막지 않음
+    """
+
+    def __init__(self, orchestrator, interval=600.0, history=20, shared_cache=None, on_snapshot=None):
+        self.orchestrator = orchestrator
+        self.shared_cache = shared_cache
+        self.on_snapshot = on_snapshot      # 교체 후 별도 스레드에서 호출 (예: 내보내기 파일 생성)
+        self._post = ThreadPoolExecutor(max_workers=1, thread_name_prefix="beautytrend-post") if on_snapshot else None
+        self.interval = interval
+        self.durations = deque(maxlen=history)
+        self.last_error = None
+        self._current = None
+        self._version = 0
+        self._wake = threading.Event()
+        self._force_next = False
+        self._stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        self.next_refresh_at = None
+
+    def current(self):
+        return self._current
+
+    def refresh(self, force=False):
+        """force=True 이면 에이전트 캐시를 무시하고 전부 재계산 (수동 새로고침), 아니면 TTL 캐시 사용"""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            run = self.orchestrator.run(force=force)
+            duration = time.perf_counter() - started
+            self.durations.append(duration)
+            if "Data Fetch" not in run.results and self._current is not None:
+                # 수집 실패 시 기존 스냅샷 유지
+                self.last_error = run.spans["Data Fetch"].error
+                return self._current
+            self._version += 1
+            results = _freeze(dict(run.results))
+            snapshot = Snapshot(
+                version=self._version,
+                created_at=datetime.now(),
+                results=results,
+                run=replace(run, results=results),
+                duration=duration,
+            )
+            self.last_error = None
+            self._current = snapshot
+            if self._post is not None:
+                # 후처리는 갱신(및 첫 세션의 시작)을 막지 않도록 비동기로 순서대로 실행
+                self._post.submit(self._after_swap, snapshot)
+            return snapshot
+
+    def _after_swap(self, snapshot):
+        if snapshot is not self._current:
+            return              # 이미 더 새 스냅샷으로 교체됨
+        try:
+            self.on_snapshot(snapshot)
+        except Exception as exc:  # 후처리 실패는 스냅샷 교체에 영향 없음
+            self.last_error = repr(exc)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.next_refresh_at = datetime.fromtimestamp(time.time() + self.interval)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            force, self._force_next = self._force_next, False
+            try:
+                self.refresh(force=force)
+            except Exception as exc:  # 스케줄러 스레드는 계속 유지
+                self.last_error = repr(exc)
+
+    def start(self):
+        if self._current is None:
+            self.refresh()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="beautytrend-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def request_refresh(self):
+        """다음 주기를 기다리지 않고 백그라운드 갱신 요청 (즉시 반환)"""
+        if self.shared_cache is not None:
+            # 공유 캐시에 남은 이번 주기 수집 결과 대신 새로 수집하도록 세대 변경
+            self.shared_cache.bump("datasets")
+        self._force_next = True
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._post is not None:
+            self._post.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def stats(self):
+        durations = list(self.durations)
+        return {
+            "version": self._current.version if self._current else 0,
+            "refreshes": len(durations),
+            "last": durations[-1] if durations else None,
+            "mean": sum(durations) / len(durations) if durations else None,
+            "max": max(durations) if durations else None,
+            "next_refresh_at": self.next_refresh_at,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+BeautyTrend AI - 레플리카 간 공유 결과 캐시
+여러 Streamlit 프로세스가 같은 계산(데이터 수집, 예측)을 한 번만 수행하도록
+콘텐츠 주소 키 + TTL + single-flight 잠금을 제공
+
+    BEAUTYTREND_CACHE_URL=file:///var/cache/beautytrend   (같은 호스트/공유 볼륨)
+    BEAUTYTREND_CACHE_URL=redis://localhost:6379/0         (Redis 호환 서버, redis 패키지 필요)
+"""
+
+import hashlib
+import os
+import pickle
+import secrets
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+MISS = object()
+
+
+def _canonical(value):
+    # 딕셔너리 순서/컨테이너 종류와 무관하게 같은 내용이면 같은 키가 되도록 정규화
+    if isinstance(value, Mapping):
+        return ("map", tuple(sorted((str(k), _canonical(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("seq", tuple(_canonical(v) for v in value))
+    if isinstance(value, np.ndarray):
+        return ("nd", str(value.dtype), value.shape, np.ascontiguousarray(value).tobytes())
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def content_key(namespace, *parts):
+    digest = hashlib.sha256(pickle.dumps(_canonical(parts), protocol=4)).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+# ============================================================
+# 저장소
+# ============================================================
+def _expired(expires, now):
+    # None = 만료 없음. 숫자가 아니면 이전 형식 파일이므로 만료로 취급
+    return expires is not None and (not isinstance(expires, (int, float)) or expires < now)
+
+
+class FileStore:
+    """
+    로컬(또는 공유 볼륨) 디렉터리 저장소. 값 쓰기는 임시 파일 + rename 으로 원자적.
+    파일은 (만료 시각, 값) 두 개의 pickle 로 저장하고, set 시 sweep_interval 마다
+    만료 시각만 읽어 지난 항목을 삭제 (콘텐츠 주소 키는 다시 읽히지 않으므로 읽기 시 검사만으로는 부족)
+    """
+
+    def __init__(self, root, sweep_interval=60.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+
+    def _path(self, key, suffix):
+        return self.root / (key.replace(":", "_") + suffix)
+
+    def get(self, key):
+        path = self._path(key, ".pkl")
+        try:
+            with path.open("rb") as f:
+                expires = pickle.load(f)
+                if _expired(expires, time.time()):
+                    value = MISS
+                else:
+                    value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return MISS
+        if value is MISS:
+            path.unlink(missing_ok=True)
+        return value
+
+    def set(self, key, value, ttl=None):
+        path = self._path(key, ".pkl")
+        tmp = path.with_suffix(f".{secrets.token_hex(4)}.tmp")
+        expires = time.time() + ttl if ttl else None
+        with tmp.open("wb") as f:
+            pickle.dump(expires, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        if time.monotonic() >= self._next_sweep:
+            self.sweep()
+
+    def sweep(self, tmp_age=3600.0):
+        """만료된 항목과 오래된 임시 파일 삭제. 삭제한 파일 수 반환"""
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        now = time.time()
+        removed = 0
+        for path in self.root.glob("*.pkl"):
+            try:
+                with path.open("rb") as f:
+                    expires = pickle.load(f)     # 값은 읽지 않음
+            except (OSError, EOFError, pickle.UnpicklingError):
+                expires = 0.0                    # 손상된 파일
+            if _expired(expires, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+        for path in self.root.glob("*.tmp"):
+            try:
+                if path.stat().st_mtime + tmp_age < now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def acquire(self, key, lease):
+        """잠금 획득 시 토큰, 다른 프로세스가 보유 중이면 None. lease 초 후 자동 만료"""
+        path = self._path(key, ".lock")
+        token = secrets.token_hex(8)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    holder = path.read_text()
+                    stale = path.stat().st_mtime + lease < time.time()
+                except FileNotFoundError:
+                    continue
+                if not stale:
+                    return None
+                return self._take_over(path, holder, token)
+            with os.fdopen(fd, "w") as f:
+                f.write(token)
+            return token
+        return None
+
+    def _take_over(self, path, holder, token):
+        # 보유 프로세스가 죽은 잠금 인계. 잠금 파일을 지우지 않고 교체하며,
+        # 이전 보유자 토큰별 표식 파일(O_EXCL)로 인계자를 한 프로세스로 제한
+        marker = path.with_name(f"{path.name}.{holder or 'empty'}.takeover")
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        os.close(fd)
+        try:
+            # 표식을 잡는 사이 이미 다른 프로세스가 인계했으면 포기
+            if path.read_text() != holder:
+                return None
+            tmp = path.with_name(f"{path.name}.{token}.tmp")
+            tmp.write_text(token)
+            os.replace(tmp, path)
+            return token
+        except FileNotFoundError:
+            return None
+        finally:
+            marker.unlink(missing_ok=True)
+
+    def release(self, key, token):
+        path = self._path(key, ".lock")
+        try:
+            if path.read_text() == token:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+
+
+class RedisStore:
+    """Redis 프로토콜 호환 서버(Redis, Valkey, KeyDB 등) 저장소"""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImportError("RedisStore 사용에는 redis 패키지가 필요합니다: pip install redis") from exc
+        self._redis = redis
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return MISS if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.client.set(key, raw, px=int(ttl * 1000) if ttl else None)
+
+    def acquire(self, key, lease):
+        token = secrets.token_hex(8)
+        if self.client.set(f"{key}:lock", token, nx=True, px=int(lease * 1000)):
+            return token
+        return None
+
+    def release(self, key, token):
+        # 내 토큰일 때만 삭제 (Lua 스크립트 미지원 서버도 고려해 WATCH/MULTI 사용)
+        lock_key = f"{key}:lock"
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(lock_key)
+                if pipe.get(lock_key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+            except self._redis.WatchError:
+                pass
+
+
+def store_from_url(url):
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisStore(url)
+    if parsed.scheme == "file":
+        return FileStore(parsed.path)
+    if parsed.scheme == "":
+        return FileStore(url)
+    raise ValueError(f"지원하지 않는 캐시 URL: {url}")
+
+
+# ============================================================
+# 공유 캐시
+# ============================================================
+class SharedCache:
+    """
+    get_or_compute(): 키가 있으면 재사용, 없으면 잠금을 얻은 한 프로세스만 계산하고
+    나머지는 결과가 저장될 때까지 대기 후 재사용 (single-flight).
+    잠금 보유자가 lock_timeout 안에 끝내지 못하면 대기자가 직접 계산
+    (에이전트 타임아웃보다 짧아야 대기자가 타임아웃 처리되지 않음).
+    잠금은 lease 초 후 만료되어 보유 프로세스가 죽어도 다음 계산이 막히지 않음.
+    """
+
+    def __init__(self, store, namespace="beautytrend", lock_timeout=5.0, lease=30.0, poll_interval=0.05):
+        self.store = store
+        self.namespace = namespace
+        self.lock_timeout = lock_timeout
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.stats = {"hits": 0, "misses": 0, "computed": 0, "waited": 0}
+
+    def key(self, name, *parts):
+        return content_key(f"{self.namespace}:{name}", *parts)
+
+    def generation(self, name):
+        """name 의 현재 세대 (bump 전에는 None). 키에 포함하면 강제 갱신 시 새 키가 됨"""
+        value = self.store.get(f"{self.namespace}:generation:{name}")
+        return None if value is MISS else value
+
+    def bump(self, name):
+        """name 의 세대를 바꿔 모든 레플리카에서 기존 공유 결과를 건너뛰게 함"""
+        self.store.set(f"{self.namespace}:generation:{name}", secrets.token_hex(8))
+
+    def get_or_compute(self, key, compute, ttl=None):
+        value = self.store.get(key)
+        if value is not MISS:
+            self.stats["hits"] += 1
+            return value
+        self.stats["misses"] += 1
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            token = self.store.acquire(key, self.lease)
+            if token is not None:
+                try:
+                    # 잠금 대기 중 다른 레플리카가 이미 저장했을 수 있음
+                    value = self.store.get(key)
+                    if value is MISS:
+                        value = compute()
+                        self.store.set(key, value, ttl)
+                        self.stats["computed"] += 1
+                    return value
+                finally:
+                    self.store.release(key, token)
+            time.sleep(self.poll_interval)
+            value = self.store.get(key)
+            if value is not MISS:
+                self.stats["waited"] += 1
+                return value
+            if time.monotonic() > deadline:
+                self.stats["computed"] += 1
+                return compute()
+
+    def cached(self, name, ttl=None):
+        """인자 내용 기반 키로 결과를 공유하는 데코레이터"""
+        def decorator(fn):
+            def wrapper(*args, **kwargs):
+                key = self.key(name, args, kwargs)
+                return self.get_or_compute(key, lambda: fn(*args, **kwargs), ttl)
+            wrapper.__wrapped__ = fn
+            return wrapper
+        return decorator
+
+
+def from_env(var="BEAUTYTREND_CACHE_URL", **kwargs):
+    url = os.environ.get(var)
+    return SharedCache(store_from_url(url), **kwargs) if url else None
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 앱 모듈은 mvp/ 에 평면 배치되어 있으므로 테스트에서도 같은 경로로 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""급부상 감지: 소규모 성분 그룹, 증분 반영, 중복 이름"""
+
+import random
+
+import numpy as np
+
+from agents import fetch_agent, make_anomaly_agent
+from anomaly import BreakoutDetector
+
+
+def fetch(seed):
+    random.seed(seed)
+    return {"Data Fetch": fetch_agent({})}
+
+
+def test_bakuchiol_breakout_flagged_at_cycle_2():
+    alerts = make_anomaly_agent()(fetch(0))["ingredients"]
+    hits = [a for a in alerts if a["series"] == "바쿠치올" and a["kind"] == "breakout"]
+    assert [a["month"] for a in hits][:1] == ["2025-02"]
+    assert hits[0]["cycle"] == 2
+
+
+def test_incremental_months_match_full_replay():
+    data = fetch(0)
+    trends = data["Data Fetch"]["historical_data"]["ingredient_trends"]
+    agent = make_anomaly_agent()
+    # 앞 10개월로 시작한 뒤 한 달씩 추가 → 처음부터 재생한 결과와 같아야 함
+    for end in (10, 11, 12):
+        partial = {name: points[:end] for name, points in trends.items()}
+        data["Data Fetch"]["historical_data"] = {"ingredient_trends": partial}
+        incremental = agent(data)["ingredients"]
+    assert incremental == make_anomaly_agent()(fetch(0))["ingredients"]
+
+
+def test_duplicate_names_are_summed():
+    detector = BreakoutDetector()
+    detector.update(["a", "b"], [100, 100])
+    detector.update(["a", "a", "b"], [100, 100, 100])
+    reference = BreakoutDetector()
+    reference.update(["a", "b"], [100, 100])
+    reference.update(["a", "b"], [200, 100])
+    assert np.allclose(detector._last[:2], reference._last[:2])
+    assert np.allclose(detector._sum[:2], reference._sum[:2])
+
+
+def test_quiet_series_small_moves_do_not_alert():
+    assert BreakoutDetector().replay({"flat": [100] * 5 + [101]}) == []
+    assert BreakoutDetector().replay({"zero": [0, 0, 0, 0, 0, 1]}) == []
+    # 변동 없던 시계열이 크게 오르면 감지
+    alerts = BreakoutDetector().replay({"flat": [1000] * 8 + [1600]})
+    assert {a.kind for a in alerts} >= {"spike"}
+
+
+def test_pure_noise_raises_few_alerts():
+    rng = np.random.default_rng(0)
+    names = [f"s{i}" for i in range(20000)]
+    for lam in (3, 30, 1000):
+        detector = BreakoutDetector()
+        per_cycle = [len(detector.update(names, rng.poisson(lam, len(names)))) for _ in range(12)]
+        assert max(per_cycle) < len(names) * 0.002
+
+
+def test_alert_history_is_bounded(monkeypatch):
+    import agents
+    monkeypatch.setattr(agents, "MAX_ALERTS", 3)
+    data = fetch(0)
+    trends = data["Data Fetch"]["historical_data"]["ingredient_trends"]
+    agent = make_anomaly_agent()
+    for end in range(2, 13):
+        data["Data Fetch"]["historical_data"] = {"ingredient_trends": {n: p[:end] for n, p in trends.items()}}
+        result = agent(data)
+    assert len(result["ingredients"]) <= 3
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""앱 스모크 테스트: 첫 렌더링, 위젯 조작 후 rerun, 내보내기 다운로드 준비"""
+
+import csv
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+import export
+from agents import MAX_FORECAST_PERIOD, fetch_agent
+from hierarchy import build_hierarchy
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def test_export_download_after_reruns(tmp_path, monkeypatch):
+    monkeypatch.setenv("BEAUTYTREND_EXPORT_DIR", str(tmp_path))
+    at = AppTest.from_file(str(APP), default_timeout=120).run()
+    assert not at.exception
+
+    # 내보내기는 스냅샷 교체 후 백그라운드에서 생성됨
+    target = export.published_dir(tmp_path, 1) / "hierarchy.csv"
+    deadline = time.monotonic() + 60
+    while not target.exists() and time.monotonic() < deadline:
+        time.sleep(0.2)
+    assert target.exists()
+
+    [picker] = [s for s in at.selectbox if s.label == "데이터"]
+    picker.set_value("계층 조정 예측").run()
+    [fmt] = [r for r in at.radio if r.label == "형식"]
+    fmt.set_value("csv").run()
+    assert not at.exception
+
+    [prepare] = [b for b in at.button if b.label == "📦 파일 준비"]
+    prepare.click().run()
+    assert not at.exception
+    [download] = at.get("download_button")
+    assert download.proto.label == "⬇️ 다운로드"
+
+    # 계층 조정 예측: 노드 × 예측 기간 행
+    data = fetch_agent({})
+    nodes = build_hierarchy(
+        data["historical_data"]["ingredient_trends"],
+        data["tiktok_data"]["ingredient_mentions"],
+        data["tiktok_data"]["hashtag_trends"],
+    ).nodes
+    with target.open(encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["level", "key", "step", "month", "base", "reconciled", "lower", "upper"]
+    assert len(rows) - 1 == len(nodes) * MAX_FORECAST_PERIOD
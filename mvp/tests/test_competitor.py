@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""경쟁사 저장소: 증분 diff, 출시월 검증, 조회 속도, 에이전트 증분 반영"""
+
+import json
+import time
+
+import pytest
+
+from agents import make_competitor_agent
+from competitor import CompetitorStore, mock_feed
+
+
+def product(name, ingredient="바쿠치올", launch="2026-03", brand="로레알"):
+    return {"brand": brand, "product": name, "category": "세럼", "key_ingredient": ingredient, "launch": launch}
+
+
+def test_diff_new_launches_shifts_removals():
+    store = CompetitorStore()
+    first = store.ingest([product("A"), product("B"), product("C")])
+    assert first.empty        # 첫 회차는 기준선
+
+    diff = store.ingest([product("A", ingredient="레티놀"), product("B"), product("D", launch="2026-04")])
+    assert [r["product"] for r in diff.new_launches] == ["D"]
+    assert [(r["product"], r["previous_ingredient"], r["key_ingredient"]) for r in diff.ingredient_shifts] == [
+        ("A", "바쿠치올", "레티놀")
+    ]
+    assert [r["product"] for r in diff.removed] == ["C"]
+    assert len(store) == 3
+    assert {r["product"] for r in store.query(key_ingredient="바쿠치올")} == {"B", "D"}
+    assert [r["product"] for r in store.query(launch_from="2026-04")] == ["D"]
+
+
+def test_rejected_launch_month_keeps_known_sku():
+    store = CompetitorStore()
+    store.ingest([product("A"), product("B", launch="2026/02")])
+    assert store.query(launch="2026-02")[0]["product"] == "B"
+
+    diff = store.ingest([product("A", launch="03/2026"), product("B", launch="2026-02")])
+    assert [r["launch"] for r in diff.rejected] == ["03/2026"]
+    assert not diff.removed
+    # 형식 오류 행은 반영하지 않고 직전 값 유지
+    assert store.query(brand="로레알", launch="2026-03")[0]["product"] == "A"
+
+
+def test_query_latency_on_mock_feed():
+    store = CompetitorStore()
+    for snapshot in mock_feed(20000):
+        store.ingest(snapshot)
+    timings = []
+    for _ in range(20):
+        started = time.perf_counter()
+        hits = store.query(brand="로레알", key_ingredient=["바쿠치올", "레티놀"], launch_from="2026-02")
+        timings.append(time.perf_counter() - started)
+    assert hits
+    # 수집 직후 첫 조회(컬럼 배열 생성 포함)도 10ms 미만
+    store.ingest(snapshot)
+    started = time.perf_counter()
+    store.query(category="세럼")
+    assert time.perf_counter() - started < 0.01
+    assert sorted(timings)[len(timings) // 2] < 0.01
+
+
+def test_agent_ingests_only_new_snapshot_files(tmp_path):
+    def write(name, products):
+        (tmp_path / name).write_text(json.dumps({"products": products}, ensure_ascii=False), encoding="utf-8")
+
+    seed = [product("A")]
+    inputs = {"Data Fetch": {"competitor_data": seed}}
+    agent = make_competitor_agent(tmp_path)
+    write("2026-03.json", [product("A"), product("B")])
+    first = agent(inputs)
+    assert first.snapshots_ingested == 2
+
+    assert agent(inputs) is first          # 새 파일 없으면 같은 저장소
+    write("2026-04.json", [product("A"), product("B"), product("C")])
+    second = agent(inputs)
+    assert second is not first and len(first) == 2   # 이전 스냅샷의 저장소는 그대로
+    assert second.snapshots_ingested == 3
+    assert [r["product"] for r in second.last_diff.new_launches] == ["C"]
+
+
+@pytest.mark.parametrize("launch", ["2026-13", "soon", "03/2026"])
+def test_invalid_launch_rejected(launch):
+    diff = CompetitorStore().ingest([product("A", launch=launch)])
+    assert len(diff.rejected) == 1
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""내보내기: 실패 시 임시 파일 정리, 프로세스별 폴더 정리"""
+
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+import export
+
+
+def test_failed_write_leaves_no_tmp(tmp_path):
+    def chunks():
+        yield {"a": np.arange(3)}
+        raise RuntimeError("중간 실패")
+
+    for fmt in export.FORMATS:
+        with pytest.raises(RuntimeError):
+            export.write_chunks(chunks(), tmp_path / f"t{export.EXTENSIONS[fmt]}", fmt)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_publish_prunes_dead_and_stale_process_dirs(tmp_path):
+    results = {"Data Fetch": {
+        "historical_data": {"ingredient_trends": {"바쿠치올": [{"month": "2025-01", "mentions": 1}] * 3}},
+        "tiktok_data": {"hashtag_trends": [{"tag": "#a", "count": 1}], "ingredient_mentions": [{"name": "x"}]},
+    }}
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead = tmp_path / f"{finished.stdout.strip()}-deadbeef"
+    stale = tmp_path / f"{os.getppid()}-0badf00d"            # 살아 있지만 오래 갱신 안 됨
+    fresh = tmp_path / f"{os.getppid()}-0000beef"            # 살아 있고 최근 갱신
+    for folder in (dead, stale, fresh):
+        (folder / "v1").mkdir(parents=True)
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+
+    export.publish(results, tmp_path, 1, formats=("csv",), max_age=600)
+    export.publish(results, tmp_path, 2, formats=("csv",), max_age=600)
+    own = tmp_path / export.PROCESS_TAG
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([fresh.name, own.name])
+    assert [p.name for p in own.iterdir()] == ["v2"]
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""계층 조정 예측: 일관성(상위 = 하위 합), 조정 방식"""
+
+import random
+import warnings
+
+import numpy as np
+import pytest
+
+from agents import fetch_agent
+from hierarchy import LEVELS, build_hierarchy
+
+
+@pytest.fixture(scope="module")
+def hierarchy():
+    random.seed(0)
+    data = fetch_agent({})
+    return build_hierarchy(
+        data["historical_data"]["ingredient_trends"],
+        data["tiktok_data"]["ingredient_mentions"],
+        data["tiktok_data"]["hashtag_trends"],
+    )
+
+
+@pytest.mark.parametrize("method", ["wls", "ols"])
+def test_reconciled_forecast_is_coherent(hierarchy, method):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")      # scipy 경고 없이 풀려야 함
+        forecast = hierarchy.forecast(12, method=method)
+    assert forecast.coherence_gap() == pytest.approx(0.0, abs=1e-6)
+    assert forecast.coherence_gap(reconciled=False) > 1.0     # 기본 예측은 합이 맞지 않음
+
+    for level in LEVELS[:-1]:
+        child_level = LEVELS[LEVELS.index(level) + 1]
+        for key in forecast.keys(level):
+            parent = forecast.series(level, key)[1]
+            children = [forecast.series(child_level, child)[1] for child in forecast.children(level, key)]
+            assert children
+            np.testing.assert_allclose(np.sum(children, axis=0), parent, rtol=1e-9)
+
+
+def test_history_sums_and_leaf_children(hierarchy):
+    forecast = hierarchy.forecast(6)
+    total = forecast.series("전체", "전체")[0]
+    ingredients = [forecast.series("성분", key)[0] for key in forecast.keys("성분")]
+    np.testing.assert_allclose(np.sum(ingredients, axis=0), total)
+    assert forecast.children("지역", forecast.keys("지역")[0]) == []
+    assert forecast.reconciled.shape[1] == 6
+
+
+def test_unknown_method_rejected(hierarchy):
+    with pytest.raises(ValueError, match="지원하지 않는 조정 방식"):
+        hierarchy.forecast(12, method="mint")
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""오케스트레이터: 동시 실행, 타임아웃, busy, stale 대체, 하위 생략, 캐시, 순환 감지"""
+
+import threading
+import time
+
+import pytest
+
+from orchestrator import Agent, Orchestrator
+
+
+def sleeper(seconds, value=None):
+    def fn(inputs):
+        time.sleep(seconds)
+        return value if value is not None else seconds
+    return fn
+
+
+def statuses(run):
+    return {name: span.status for name, span in run.spans.items()}
+
+
+def test_independent_agents_run_concurrently():
+    orchestrator = Orchestrator([
+        Agent("root", sleeper(0.0, "data")),
+        Agent("fast", sleeper(0.1), deps=("root",)),
+        Agent("mid", sleeper(0.3), deps=("root",)),
+        Agent("slow", sleeper(0.5), deps=("root",)),
+        Agent("join", lambda inputs: sum(inputs.values()), deps=("fast", "mid", "slow")),
+    ])
+    run = orchestrator.run()
+    assert run.ok
+    assert run.results["join"] == pytest.approx(0.9)
+    assert run.elapsed < 0.8            # 순차 실행이면 0.9s 이상
+
+
+def test_timeout_skips_downstream_then_busy_until_call_finishes():
+    release = threading.Event()
+    orchestrator = Orchestrator([
+        Agent("hang", lambda inputs: release.wait(5), timeout=0.1),
+        Agent("after", lambda inputs: "x", deps=("hang",)),
+    ])
+    first = orchestrator.run()
+    assert statuses(first) == {"hang": "timeout", "after": "skipped"}
+
+    # 버려진 호출이 아직 실행 중이면 재제출하지 않음
+    second = orchestrator.run()
+    assert statuses(second) == {"hang": "busy", "after": "skipped"}
+    assert second.elapsed < 0.1
+
+    release.set()
+    time.sleep(0.05)
+    third = orchestrator.run()
+    assert statuses(third) == {"hang": "ok", "after": "ok"}
+
+
+def test_failure_falls_back_to_stale_result():
+    calls = []
+
+    def flaky(inputs):
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("수집 실패")
+        return "v1"
+
+    orchestrator = Orchestrator([
+        Agent("fetch", flaky, cache_ttl=60),
+        Agent("use", lambda inputs: inputs["fetch"] + "!", deps=("fetch",)),
+    ])
+    assert orchestrator.run().results["use"] == "v1!"
+    run = orchestrator.run(force=True)
+    assert run.spans["fetch"].status == "stale"
+    assert "수집 실패" in run.spans["fetch"].error
+    assert run.results["use"] == "v1!"
+
+
+def test_cache_hit_until_forced():
+    calls = []
+    orchestrator = Orchestrator([Agent("a", lambda inputs: calls.append(1) or len(calls), cache_ttl=60)])
+    assert orchestrator.run().results["a"] == 1
+    run = orchestrator.run()
+    assert statuses(run) == {"a": "cached"} and run.results["a"] == 1
+    assert orchestrator.run(force=True).results["a"] == 2
+
+
+def test_cycle_and_unknown_dependency_rejected():
+    with pytest.raises(ValueError, match="순환"):
+        Orchestrator([Agent("a", sleeper(0), deps=("b",)), Agent("b", sleeper(0), deps=("a",))])
+    with pytest.raises(ValueError, match="알 수 없는"):
+        Orchestrator([Agent("a", sleeper(0), deps=("missing",))])
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""갱신 스케줄러: 스냅샷 불변성, 주기 갱신은 캐시 사용 / 수동 요청은 강제 재계산"""
+
+import random
+
+import pytest
+
+from agents import build_orchestrator
+from orchestrator import Agent, Orchestrator
+from refresh import RefreshScheduler
+
+
+@pytest.fixture(scope="module")
+def snapshot():
+    random.seed(0)
+    scheduler = RefreshScheduler(build_orchestrator())
+    yield scheduler.refresh()
+    scheduler.orchestrator.shutdown()
+
+
+def test_snapshot_results_are_read_only(snapshot):
+    rows = snapshot.results["Data Fetch"]["tiktok_data"]["hashtag_trends"]
+    with pytest.raises(TypeError):
+        rows[0]["count"] = -1
+    # 실행 기록에 남은 결과도 같은 읽기 전용 매핑
+    assert snapshot.run.results is snapshot.results
+    assert isinstance(snapshot.run.results["Data Fetch"]["tiktok_data"]["hashtag_trends"], tuple)
+
+
+def test_dataclass_arrays_are_read_only(snapshot):
+    forecast = snapshot.results["Hierarchy"]
+    assert not forecast.reconciled.flags.writeable
+    with pytest.raises(ValueError):
+        forecast.reconciled[0, 0] = 0
+    with pytest.raises(TypeError):
+        forecast.nodes[0]["key"] = "x"
+    assert forecast.series("성분", "바쿠치올")[0].shape == forecast.history[0].shape
+
+
+def test_scheduled_refresh_uses_cache_and_manual_forces():
+    calls = []
+    orchestrator = Orchestrator([Agent("Data Fetch", lambda inputs: calls.append(1) or len(calls), cache_ttl=60)])
+    scheduler = RefreshScheduler(orchestrator)
+    scheduler.refresh()
+    assert scheduler.refresh().results["Data Fetch"] == 1
+    assert scheduler.refresh(force=True).results["Data Fetch"] == 2
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""공유 캐시 single-flight: 여러 레플리카가 동시에 요청해도 계산은 한 번"""
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shared_cache import FileStore, SharedCache, store_from_url
+
+REPLICAS = 8
+
+
+def run_replicas(make_store, key="datasets"):
+    # 레플리카마다 별도 SharedCache/저장소 인스턴스 - 조정은 저장소 잠금으로만 이뤄짐
+    calls = []
+    lock = threading.Lock()
+    start = threading.Barrier(REPLICAS)
+
+    def compute():
+        with lock:
+            calls.append(1)
+        time.sleep(0.3)
+        return {"value": 42}
+
+    def replica(_):
+        cache = SharedCache(make_store(), lock_timeout=5.0)
+        start.wait()
+        return cache.get_or_compute(cache.key(key), compute, ttl=60)
+
+    with ThreadPoolExecutor(REPLICAS) as pool:
+        results = list(pool.map(replica, range(REPLICAS)))
+    return len(calls), results
+
+
+def test_file_store_single_flight(tmp_path):
+    computed, results = run_replicas(lambda: FileStore(tmp_path))
+    assert computed == 1
+    assert results == [{"value": 42}] * REPLICAS
+
+
+def test_file_store_stale_lock_taken_over_once(tmp_path):
+    # 죽은 프로세스가 남긴 잠금: 대기자 중 한 곳만 인계해 계산
+    store = FileStore(tmp_path)
+    cache = SharedCache(store)
+    lock = store._path(cache.key("datasets"), ".lock")
+    lock.write_text("dead-owner")
+    old = time.time() - 3600
+    os.utime(lock, (old, old))
+
+    computed, results = run_replicas(lambda: FileStore(tmp_path))
+    assert computed == 1
+    assert results == [{"value": 42}] * REPLICAS
+    assert not list(tmp_path.glob("*.takeover"))
+
+
+@pytest.fixture
+def redis_url():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("redis")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = fakeredis.TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{port}/0"
+    server.shutdown()
+    server.server_close()
+
+
+def test_redis_store_single_flight(redis_url):
+    computed, results = run_replicas(lambda: store_from_url(redis_url))
+    assert computed == 1
+    assert results == [{"value": 42}] * REPLICAS
+
+
+def test_bump_skips_shared_result(tmp_path):
+    cache = SharedCache(FileStore(tmp_path))
+    key = lambda: cache.key("datasets", cache.generation("datasets"))
+    first = cache.get_or_compute(key(), lambda: 1, ttl=60)
+    cache.bump("datasets")
+    assert first == 1
+    assert cache.get_or_compute(key(), lambda: 2, ttl=60) == 2
+
+
+def test_file_store_sweeps_expired_entries(tmp_path):
+    store = FileStore(tmp_path, sweep_interval=0)
+    store.set("old", "x", ttl=0.01)
+    store.set("forever", "y")
+    time.sleep(0.05)
+    # 다시 읽히지 않는 키도 다음 쓰기 때 정리됨
+    store.set("new", "z", ttl=60)
+    assert sorted(p.name for p in tmp_path.glob("*.pkl")) == ["forever.pkl", "new.pkl"]
+    assert store.get("forever") == "y"
+    assert store.get("new") == "z"